@@ -256,9 +256,11 @@ if __name__ == "__main__":
     num_samples = 20
     target_size = (224, 224)
     
-    # Create random image arrays (simulating loaded images)
-    synthetic_images = np.random.rand(num_samples, *target_size, 3).astype(np.float32)
-    labels = np.random.randint(0, 2, num_samples)
+    # Create random image arrays (simulating loaded images); float32 is drawn
+    # directly instead of allocating float64 and casting
+    rng = np.random.default_rng(42)
+    synthetic_images = rng.random((num_samples, *target_size, 3), dtype=np.float32)
+    labels = rng.integers(0, 2, num_samples, dtype=np.int8)
     
     # For demonstration, we'll directly split without loading from paths
     logger.info("="*60)
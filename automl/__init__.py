@@ -9,6 +9,14 @@ Internal modules are considered implementation details and are not part
 of the public API.
 """
 
-from .pipeline import run_pipeline
-
 __all__ = ["run_pipeline"]
+
+
+def __getattr__(name):
+    # Resolve run_pipeline on first access so importing automl.utils helpers
+    # does not pull in sklearn and the full pipeline
+    if name == "run_pipeline":
+        from .pipeline import run_pipeline
+
+        return run_pipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,46 @@
+"""
+Lag Feature Kernel
+==================
+Numba-compiled lag construction for very long time series. Used by
+``timeseries_preprocessing`` only when numba is installed and the output is
+large enough to amortize JIT warmup.
+
+Author: AutoML System
+Date: December 2025
+Python Version: 3.10+
+"""
+
+import numpy as np
+
+try:  # numba is optional; callers fall back to the NumPy lag path without it
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - environment dependent
+    njit = None
+
+# Minimum N * C * n_lags before the JIT kernel beats the NumPy path
+NUMBA_LAG_THRESHOLD = 10_000_000
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def fill_lags(src, dst, n_lags):  # pragma: no cover - compiled
+        """
+        Fill ``dst`` (N, C * n_lags) with lags 1..n_lags of each column of ``src`` (N, C).
+
+        Layout matches ``_lag_matrix``: col_0 lags 1..n_lags, col_1 lags 1..n_lags, ...
+        Entries whose lag reaches before the first row are NaN.
+        """
+        n_rows, n_cols = src.shape
+        for c in prange(n_cols):
+            base = c * n_lags
+            for lag in range(1, n_lags + 1):
+                out = base + lag - 1
+                for i in range(min(lag, n_rows)):
+                    dst[i, out] = np.nan
+                for i in range(lag, n_rows):
+                    dst[i, out] = src[i - lag, c]
+else:  # pragma: no cover - environment dependent
+    fill_lags = None
+
+
+__all__ = ["NUMBA_LAG_THRESHOLD", "fill_lags"]
@@ -10,6 +10,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from sklearn.feature_selection import RFE, VarianceThreshold
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingClassifier, GradientBoostingRegressor
 from sklearn.linear_model import LogisticRegression, LinearRegression
@@ -27,7 +28,7 @@ def select_features(
 	Parameters
 	----------
 	X : Any
-		Preprocessed feature matrix (numpy array or pandas DataFrame).
+		Preprocessed feature matrix (numpy array, scipy sparse matrix or pandas DataFrame).
 	y : Any
 		Target labels or values.
 	method : str, optional
@@ -95,9 +96,12 @@ def select_features(
 	return result
 
 
-def _ensure_array_and_names(X: Any) -> Tuple[np.ndarray, Optional[List[str]]]:
+def _ensure_array_and_names(X: Any) -> Tuple[Any, Optional[List[str]]]:
 	if isinstance(X, pd.DataFrame):
 		return X.to_numpy(), list(X.columns)
+	if sp.issparse(X):
+		# Keep sparse input (e.g. TF-IDF) sparse; selectors and estimators accept CSR
+		return X.tocsr(), None
 	X_array = np.asarray(X)
 	return X_array, None
 
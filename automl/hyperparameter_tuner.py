@@ -24,6 +24,7 @@ def tune_hyperparameters(
     task_type: str,
     search_method: str = "grid",
     param_grid: Optional[Dict[str, Iterable]] = None,
+    n_jobs: int = -1,
 ) -> Dict[str, Any]:
     """Tune hyperparameters for a selected model using specified search method.
 
@@ -41,6 +42,8 @@ def tune_hyperparameters(
         "grid", "random", or "bayesian" (if Optuna is installed). Default is "grid".
     param_grid : Optional[Dict[str, Iterable]]
         Hyperparameter search space. If None, a reasonable default is used based on model type.
+    n_jobs : int, optional
+        Parallel workers for cross-validation fits (-1 uses all cores). Default is -1.
 
     Returns
     -------
@@ -70,13 +73,13 @@ def tune_hyperparameters(
     print(f"Hyperparameter tuning method: {normalized_method}")
 
     if normalized_method == "grid":
-        search = GridSearchCV(model, param_grid, scoring=scoring, cv=cv, n_jobs=-1)
+        search = GridSearchCV(model, param_grid, scoring=scoring, cv=cv, n_jobs=n_jobs)
         search.fit(X_train, y_train)
         best_estimator = search.best_estimator_
         best_params = search.best_params_
         best_score = float(search.best_score_)
     elif normalized_method == "random":
-        search = RandomizedSearchCV(model, param_grid, scoring=scoring, cv=cv, n_jobs=-1, n_iter=_estimate_n_iter(param_grid))
+        search = RandomizedSearchCV(model, param_grid, scoring=scoring, cv=cv, n_jobs=n_jobs, n_iter=_estimate_n_iter(param_grid))
         search.fit(X_train, y_train)
         best_estimator = search.best_estimator_
         best_params = search.best_params_
@@ -84,7 +87,7 @@ def tune_hyperparameters(
     else:  # bayesian
         if optuna is None:
             raise ValueError("Optuna is not installed. Install optuna or choose 'grid'/'random'.")
-        best_estimator, best_params, best_score = _optuna_tune(model, X_train, y_train, scoring, cv, param_grid)
+        best_estimator, best_params, best_score = _optuna_tune(model, X_train, y_train, scoring, cv, param_grid, n_jobs)
 
     print(f"Best parameters: {best_params}")
     print(f"Best cross-val score ({scoring}): {best_score:.6f}")
@@ -161,7 +164,7 @@ def _estimate_n_iter(param_grid: Dict[str, Iterable]) -> int:
     return min(total, 50)
 
 
-def _optuna_tune(model: Any, X_train: Any, y_train: Any, scoring: str, cv: int, param_grid: Dict[str, Iterable]):
+def _optuna_tune(model: Any, X_train: Any, y_train: Any, scoring: str, cv: int, param_grid: Dict[str, Iterable], n_jobs: int = -1):
     """Perform a simple Optuna-based tuning using provided param_grid as bounds."""
 
     from sklearn.model_selection import cross_val_score
@@ -180,7 +183,7 @@ def _optuna_tune(model: Any, X_train: Any, y_train: Any, scoring: str, cv: int,
             estimator.set_params(**params)
         except Exception:
             pass
-        scores = cross_val_score(estimator, X_train, y_train, scoring=scoring, cv=cv, n_jobs=-1)
+        scores = cross_val_score(estimator, X_train, y_train, scoring=scoring, cv=cv, n_jobs=n_jobs)
         return float(np.mean(scores))
 
     study = optuna.create_study(direction="maximize")  # accuracy or neg_mse
@@ -15,12 +15,16 @@ import logging
 from pathlib import Path
 
 from .preprocessing import preprocess_data
+from .tabular_preprocessing import preprocess_tabular_streaming
 from .feature_selection import select_features
 from .model_trainer import train_models
 from .evaluator import evaluate_models
 from .model_selector import select_best_model
 from .hyperparameter_tuner import tune_hyperparameters
-from .utils.artifact_manager import save_artifacts, generate_run_id
+from .utils.artifact_manager import save_artifacts, generate_run_id, DEFAULT_COMPRESS
+
+# Keyword arguments accepted by preprocess_tabular_streaming
+_STREAMING_PARAMS = ("test_size", "val_size", "random_state", "chunk_size_mb", "memmap_dir")
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +46,9 @@ def run_pipeline(
 	job_id: Optional[str] = None,
 	model_output_dir: Optional[Path] = None,
 	artifacts_dir: Optional[Path] = None,
+	streaming_threshold_mb: float = 1024.0,
+	compress: Optional[Any] = None,
+	top_k: int = 50,
 ) -> Dict[str, Any]:
 	"""Run the end-to-end AutoML pipeline with artifact persistence.
 
@@ -74,7 +81,7 @@ def run_pipeline(
 	model_training_params : Optional[Dict[str, Any]]
 		Options for model selection (e.g., subset of models to train).
 	hyperparameter_params : Optional[Dict[str, Any]]
-		Tuning options such as search_method and param_grid.
+		Tuning options such as search_method, param_grid and n_jobs.
 	job_id : Optional[str]
 		Job identifier for tracking. If None, pipeline still runs but artifacts
 		are saved to a timestamp-based run_id.
@@ -82,6 +89,15 @@ def run_pipeline(
 		DEPRECATED: Use artifacts_dir instead. Kept for backward compatibility.
 	artifacts_dir : Optional[Path]
 		Directory to save artifacts. Defaults to 'artifacts/'.
+	streaming_threshold_mb : float, default=1024.0
+		Tabular CSV paths larger than this are preprocessed in chunks via
+		`preprocess_tabular_streaming` instead of being loaded into memory;
+		preprocessing_params keys it does not accept are ignored.
+	compress : Optional[Any]
+		joblib compression for the model and preprocessing pickles. Defaults
+		to ("lz4", 3) when lz4 is installed, otherwise zlib level 3.
+	top_k : int, default=50
+		Number of most important features reported in `feature_importance`.
 
 	Returns
 	-------
@@ -151,16 +167,24 @@ def run_pipeline(
 	data_type = _detect_data_type(dataset)
 	print(f"Detected data type: {data_type}")
 
-	# 2) Load dataset if CSV path
-	if isinstance(dataset, str):
-		print(f"Loading dataset from CSV: {dataset}")
-		dataset_df = pd.read_csv(dataset)
+	# 2) Stream large tabular CSVs; otherwise load dataset if CSV path
+	if isinstance(dataset, str) and data_type == "tabular" and _file_size_mb(dataset) > streaming_threshold_mb:
+		print(f"Streaming large CSV in chunks: {dataset}")
+		streaming_params = {k: v for k, v in preprocessing_params.items() if k in _STREAMING_PARAMS}
+		ignored = sorted(set(preprocessing_params) - set(streaming_params))
+		if ignored:
+			logger.info(f"Ignoring preprocessing params not used by streaming: {ignored}")
+		data_splits, _ = preprocess_tabular_streaming(dataset, target_col=target_column, **streaming_params)
 	else:
-		dataset_df = dataset
+		if isinstance(dataset, str):
+			print(f"Loading dataset from CSV: {dataset}")
+			dataset_df = pd.read_csv(dataset)
+		else:
+			dataset_df = dataset
 
-	# 3) Preprocess via dispatcher
-	print("Preprocessing data...")
-	data_splits, _ = preprocess_data(dataset_df, data_type, target_col=target_column, **preprocessing_params)
+		# 3) Preprocess via dispatcher
+		print("Preprocessing data...")
+		data_splits, _ = preprocess_data(dataset_df, data_type, target_col=target_column, **preprocessing_params)
 	X_train = data_splits.get("X_train")
 	X_test = data_splits.get("X_test")
 	y_train = data_splits.get("y_train")
@@ -168,13 +192,11 @@ def run_pipeline(
 	feature_names = data_splits.get("feature_names")
 
 	# Collect preprocessing artifacts for persistence
-	preprocessors = {}
-	if "scaler" in data_splits:
-		preprocessors["scaler"] = data_splits["scaler"]
-	if "encoders" in data_splits:
-		preprocessors["encoders"] = data_splits["encoders"]
-	if "vectorizer" in data_splits:
-		preprocessors["vectorizer"] = data_splits["vectorizer"]
+	preprocessors = {
+		key: data_splits[key]
+		for key in ("scaler", "encoders", "vectorizer", "column_transformer", "numeric_cols", "text_col")
+		if key in data_splits
+	}
 
 	selected_features = None
 	selected_indices = None
@@ -221,7 +243,9 @@ def run_pipeline(
 		print("Tuning hyperparameters for selected model...")
 		search_method = hyperparameter_params.get("search_method", "grid")
 		param_grid = hyperparameter_params.get("param_grid")
-		tuned_model_result = tune_hyperparameters(best_model_object, X_train, y_train, task_type, search_method=search_method, param_grid=param_grid)
+		n_jobs = hyperparameter_params.get("n_jobs", -1)
+		# joblib auto-memmaps large arrays for the search's worker processes
+		tuned_model_result = tune_hyperparameters(best_model_object, X_train, y_train, task_type, search_method=search_method, param_grid=param_grid, n_jobs=n_jobs)
 		if tuned_model_result and "tuned_model" in tuned_model_result:
 			final_model = tuned_model_result["tuned_model"]
 			logger.info(f"Using tuned model for persistence")
@@ -235,27 +259,31 @@ def run_pipeline(
 		cm_array = best_eval.get("confusion_matrix")
 		if cm_array is not None:
 			# Get unique labels from y_test
-			unique_labels = sorted(set(y_test))
+			unique_labels = np.unique(y_test)
 			confusion_matrix_data = {
 				"matrix": cm_array.tolist() if hasattr(cm_array, "tolist") else cm_array,
-				"labels": [str(label) for label in unique_labels]
+				"labels": [str(label) for label in unique_labels.tolist()]
 			}
 
 	# Extract feature importance if available
 	feature_importance_data = None
-	if hasattr(final_model, "feature_importances_"):
-		importances = final_model.feature_importances_
-		if selected_features and len(selected_features) == len(importances):
-			indices = np.argsort(importances)[::-1]
-			feature_importance_data = [
-				{"feature": selected_features[i], "importance": float(importances[i])}
-				for i in indices
-			]
-		elif feature_names and len(feature_names) == len(importances):
-			indices = np.argsort(importances)[::-1]
+	importances = getattr(final_model, "feature_importances_", None)
+	if importances is not None:
+		n = importances.shape[0]
+		if selected_features and len(selected_features) == n:
+			names = selected_features
+		elif feature_names and len(feature_names) == n:
+			names = feature_names
+		else:
+			names = None
+		k = min(top_k, n)
+		if names and k > 0:
+			# Partial selection of the top-k, then sort only those k
+			part = np.argpartition(-importances, k - 1)[:k]
+			order = part[np.argsort(-importances[part])]
 			feature_importance_data = [
-				{"feature": feature_names[i], "importance": float(importances[i])}
-				for i in indices
+				{"feature": names[i], "importance": value}
+				for i, value in zip(order.tolist(), importances[order].tolist())
 			]
 
 	# Prepare metrics for persistence
@@ -278,6 +306,8 @@ def run_pipeline(
 		"task_type": task_type,
 	}
 
+	compress = DEFAULT_COMPRESS if compress is None else compress
+
 	# Save artifacts using artifact manager
 	artifact_paths = save_artifacts(
 		run_id=run_id,
@@ -286,6 +316,7 @@ def run_pipeline(
 		metrics=metrics_json,
 		feature_metadata=feature_metadata,
 		base_dir=final_artifacts_dir,
+		compress=compress,
 	)
 
 	logger.info("Artifacts saved successfully")
@@ -294,7 +325,7 @@ def run_pipeline(
 	if model_output_dir and job_id:
 		model_output_dir.mkdir(parents=True, exist_ok=True)
 		model_path = model_output_dir / "best_model.pkl"
-		joblib.dump(final_model, model_path, protocol=4)
+		joblib.dump(final_model, model_path, compress=compress, protocol=5)
 		logger.info(f"Legacy model artifact saved to: {model_path}")
 
 	# Serialize tuned_model result (strip model object, keep params only)
@@ -332,6 +363,14 @@ def run_pipeline(
 	}
 
 
+def _file_size_mb(path: str) -> float:
+	"""Return the size of a file in megabytes, or 0 if it cannot be read."""
+	try:
+		return Path(path).stat().st_size / (1024 ** 2)
+	except OSError:
+		return 0.0
+
+
 def _detect_data_type(dataset: Any) -> str:
 	"""Detect the dataset type: tabular, text, image, or timeseries.
 
@@ -341,14 +380,13 @@ def _detect_data_type(dataset: Any) -> str:
 		# Assume tabular CSV by default for paths
 		return "tabular"
 	if isinstance(dataset, pd.DataFrame):
-		# Heuristic: if there's a text-like column with long strings → text
-		if any(dataset.dtypes[col] == object for col in dataset.columns):
-			# If majority of values are strings and long-ish, consider text
-			obj_cols = [c for c in dataset.columns if dataset.dtypes[c] == object]
-			if obj_cols:
-				return "text" if len(obj_cols) == 1 else "tabular"
+		dtypes = dataset.dtypes
+		# Heuristic: a single text-like (object) column → text, several → tabular
+		obj_mask = dtypes == object
+		if obj_mask.any():
+			return "text" if obj_mask.sum() == 1 else "tabular"
 		# If a datetime column exists and temporal structure likely → timeseries
-		if any(pd.api.types.is_datetime64_any_dtype(dataset[c]) for c in dataset.columns):
+		if dtypes.map(pd.api.types.is_datetime64_any_dtype).any():
 			return "timeseries"
 		return "tabular"
 	# If list-like of paths (images)
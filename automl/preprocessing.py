@@ -19,7 +19,7 @@ from typing import Tuple, Optional, Union, List
 import pandas as pd
 
 # Import modular preprocessing functions
-from .tabular_preprocessing import preprocess_tabular
+from .tabular_preprocessing import preprocess_tabular, preprocess_tabular_streaming
 from .text_preprocessing import preprocess_text
 from .Image_preprocessing import preprocess_image
 from .timeseries_preprocessing import preprocess_timeseries
@@ -158,6 +158,7 @@ def preprocess_data(data: Union[pd.DataFrame, List],
 __all__ = [
     'preprocess_data',
     'preprocess_tabular',
+    'preprocess_tabular_streaming',
     'preprocess_text',
     'preprocess_image',
     'preprocess_timeseries'
@@ -9,12 +9,18 @@ Python Version: 3.10+
 """
 
 import logging
+import os
+import tempfile
 import warnings
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import (FunctionTransformer, LabelEncoder, OneHotEncoder,
+                                   OrdinalEncoder, StandardScaler)
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +31,53 @@ logger = logging.getLogger(__name__)
 
 warnings.filterwarnings('ignore')
 
+_NUMERIC_DTYPES = ['int64', 'float64', 'int32', 'float32']
+_CATEGORICAL_DTYPES = ['object', 'category', 'bool']
+
+
+def _detect_columns(X: pd.DataFrame) -> Tuple[list, list]:
+    """Return (numeric_cols, categorical_cols) for ``X``."""
+    numeric_cols = X.select_dtypes(include=_NUMERIC_DTYPES).columns.tolist()
+    categorical_cols = X.select_dtypes(include=_CATEGORICAL_DTYPES).columns.tolist()
+    return numeric_cols, categorical_cols
+
+
+def _build_column_transformer(X: pd.DataFrame,
+                              numeric_cols: list,
+                              categorical_cols: list,
+                              encoders: dict,
+                              scaler: StandardScaler) -> Pipeline:
+    """
+    Fit a single transformer that reproduces the training feature matrix.
+    
+    Mirrors preprocess_tabular column for column: mean/mode imputation, one-hot
+    (drop first) or label encoding per categorical column, then the already
+    fitted StandardScaler. Lets inference run one vectorized ``transform`` on a
+    raw DataFrame instead of per-column encoder loops.
+    
+    Every step is a scikit-learn estimator or wraps a public pandas/NumPy
+    callable, so the pickled pipeline loads without this package installed.
+    """
+    transformers = [('num', SimpleImputer(strategy='mean', keep_empty_features=True), numeric_cols)]
+    for col in categorical_cols:
+        steps = []
+        # bool columns cannot hold missing values
+        if X[col].dtype != bool:
+            # fillna catches every missing marker (None, pd.NA, NaT), as in training
+            mode = X[col].mode()
+            fill_value = mode.iloc[0] if not mode.empty else 'missing'
+            steps.append(FunctionTransformer(pd.DataFrame.fillna, kw_args={'value': fill_value}))
+        if encoders[col]['type'] == 'onehot':
+            steps.append(OneHotEncoder(drop='first', handle_unknown='ignore', sparse_output=False))
+        else:
+            # Cast to str like the LabelEncoder input at fit time
+            steps += [FunctionTransformer(np.asarray, kw_args={'dtype': str}),
+                      OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)]
+        transformers.append((col, make_pipeline(*steps), [col]))
+    column_transformer = ColumnTransformer(transformers, remainder='drop')
+    column_transformer.fit(X)
+    return Pipeline([('columns', column_transformer), ('scaler', scaler)])
+
 
 def preprocess_tabular(df: pd.DataFrame, 
                        target_col: Optional[str] = None,
@@ -59,15 +112,18 @@ def preprocess_tabular(df: pd.DataFrame,
     --------
     data_splits : dict
         Dictionary containing:
-        - 'X_train': Training features
-        - 'X_val': Validation features
-        - 'X_test': Test features
+        - 'X_train': Training features (float32)
+        - 'X_val': Validation features (float32)
+        - 'X_test': Test features (float32)
         - 'y_train': Training target (if target_col provided)
         - 'y_val': Validation target (if target_col provided)
         - 'y_test': Test target (if target_col provided)
         - 'feature_names': List of feature names after encoding
         - 'scaler': Fitted StandardScaler object
         - 'encoders': Dictionary of fitted encoders
+        - 'column_transformer': Fitted Pipeline (imputation + encoding + scaler)
+          mapping raw feature columns to the scaled matrix in one call
+        - 'numeric_cols': Names of the numeric input columns
     y : np.ndarray or None
         Full target array (if target_col provided)
         
@@ -86,9 +142,7 @@ def preprocess_tabular(df: pd.DataFrame,
     logger.info("Starting tabular data preprocessing...")
     logger.info("="*60)
     
-    df = df.copy()
-    
-    # Separate features and target
+    # Separate features and target (no upfront copy: all later ops return new frames)
     if target_col:
         if target_col not in df.columns:
             raise ValueError(f"Target column '{target_col}' not found in DataFrame")
@@ -101,8 +155,8 @@ def preprocess_tabular(df: pd.DataFrame,
         logger.info("✓ No target column specified (unsupervised learning)")
     
     # Detect column types
-    numeric_cols = X.select_dtypes(include=['int64', 'float64', 'int32', 'float32']).columns.tolist()
-    categorical_cols = X.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
+    numeric_cols, categorical_cols = _detect_columns(X)
+    X_raw = X
     
     logger.info(f"\n📊 Column Detection:")
     logger.info(f"  • Numeric columns: {len(numeric_cols)}")
@@ -112,18 +166,28 @@ def preprocess_tabular(df: pd.DataFrame,
     logger.info(f"\n🔧 Handling Missing Values:")
     
     # Numeric columns: fill with mean
-    for col in numeric_cols:
-        if X[col].isnull().any():
-            mean_val = X[col].mean()
-            X[col].fillna(mean_val, inplace=True)
-            logger.info(f"  • {col} (numeric): filled with mean = {mean_val:.2f}")
+    num_missing = X[numeric_cols].isnull().any()
+    num_filled = num_missing[num_missing].index.tolist()
+    num_fill = X[num_filled].mean().to_dict() if num_filled else {}
     
     # Categorical columns: fill with mode
-    for col in categorical_cols:
-        if X[col].isnull().any():
-            mode_val = X[col].mode()[0] if not X[col].mode().empty else 'missing'
-            X[col].fillna(mode_val, inplace=True)
-            logger.info(f"  • {col} (categorical): filled with mode = '{mode_val}'")
+    cat_missing = X[categorical_cols].isnull().any()
+    cat_filled = cat_missing[cat_missing].index.tolist()
+    cat_fill = {}
+    for col in cat_filled:
+        mode = X[col].mode()
+        cat_fill[col] = mode.iloc[0] if not mode.empty else 'missing'
+    if num_fill or cat_fill:
+        # Non-inplace fillna returns a new frame and never touches the caller's df
+        X = X.fillna({**num_fill, **cat_fill})
+    
+    logger.info("  • Filled %d numeric cols with mean, %d categorical cols with mode",
+                len(num_filled), len(cat_filled))
+    if logger.isEnabledFor(logging.DEBUG):
+        for col in num_filled:
+            logger.debug("  • %s (numeric): filled with mean = %.2f", col, num_fill[col])
+        for col, mode_val in cat_fill.items():
+            logger.debug("  • %s (categorical): filled with mode = '%s'", col, mode_val)
     
     # Encode categorical variables
     logger.info(f"\n🔤 Encoding Categorical Variables:")
@@ -135,18 +199,21 @@ def preprocess_tabular(df: pd.DataFrame,
         
         if n_unique <= 10:
             # One-Hot Encoding for low cardinality
-            logger.info(f"  • {col}: One-Hot Encoding ({n_unique} unique values)")
+            logger.debug("  • %s: One-Hot Encoding (%d unique values)", col, n_unique)
             dummies = pd.get_dummies(X[col], prefix=col, drop_first=True)
             encoded_dfs.append(dummies)
             encoders[col] = {'type': 'onehot', 'columns': dummies.columns.tolist()}
         else:
             # Label Encoding for high cardinality
-            logger.info(f"  • {col}: Label Encoding ({n_unique} unique values)")
+            logger.debug("  • %s: Label Encoding (%d unique values)", col, n_unique)
             le = LabelEncoder()
             encoded_values = le.fit_transform(X[col].astype(str))
             encoded_dfs.append(pd.DataFrame({col: encoded_values}, index=X.index))
             encoders[col] = {'type': 'label', 'encoder': le}
     
+    n_onehot = sum(1 for enc in encoders.values() if enc['type'] == 'onehot')
+    logger.info("  • One-Hot encoded %d cols, Label encoded %d cols", n_onehot, len(encoders) - n_onehot)
+    
     # Combine numeric and encoded categorical features
     if encoded_dfs:
         X_encoded = pd.concat([X[numeric_cols]] + encoded_dfs, axis=1)
@@ -159,8 +226,14 @@ def preprocess_tabular(df: pd.DataFrame,
     # Scale numeric features
     logger.info(f"\n⚖️  Scaling Features:")
     logger.info(f"  • Using StandardScaler (mean=0, std=1)")
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X_encoded)
+    # Convert once to float32 and scale in place (skips check_array's extra copy)
+    X_arr = X_encoded.to_numpy(dtype=np.float32, copy=False)
+    scaler = StandardScaler(copy=False)
+    X_scaled = scaler.fit_transform(X_arr)
+    # The fitted scaler is returned and persisted; later transforms must not
+    # overwrite the caller's arrays
+    scaler.set_params(copy=True)
+    column_transformer = _build_column_transformer(X_raw, numeric_cols, categorical_cols, encoders, scaler)
     
     # Split into train/val/test sets
     logger.info(f"\n✂️  Splitting Data:")
@@ -207,7 +280,9 @@ def preprocess_tabular(df: pd.DataFrame,
             'y_test': y_test,
             'feature_names': feature_names,
             'scaler': scaler,
-            'encoders': encoders
+            'encoders': encoders,
+            'column_transformer': column_transformer,
+            'numeric_cols': list(numeric_cols)
         }, y
     else:
         # Unsupervised: just split features
@@ -232,10 +307,302 @@ def preprocess_tabular(df: pd.DataFrame,
             'X_test': X_test,
             'feature_names': feature_names,
             'scaler': scaler,
-            'encoders': encoders
+            'encoders': encoders,
+            'column_transformer': column_transformer,
+            'numeric_cols': list(numeric_cols)
         }, None
 
 
+def _rows_per_chunk(path: str, chunk_size_mb: float, sample_rows: int = 1000) -> int:
+    """Estimate how many CSV rows fit in ``chunk_size_mb`` of DataFrame memory."""
+    sample = pd.read_csv(path, nrows=sample_rows, engine="c")
+    if sample.empty:
+        return sample_rows
+    bytes_per_row = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+    return max(1, int(chunk_size_mb * 1024 ** 2 // max(bytes_per_row, 1)))
+
+
+def _scan_csv(path: str,
+              chunksize: int,
+              target_col: Optional[str],
+              dtype: Dict[str, type]) -> dict:
+    """
+    First pass over the CSV: schema, row count, numeric sums and categorical vocabularies.
+    
+    Column types are resolved over every chunk, not just the first. A column
+    that is categorical in any chunk is categorical; ``mixed`` lists the ones
+    whose dtype also changes between chunks (e.g. numbers in early chunks,
+    strings later) so the caller can re-read them as text, as a full read would.
+    """
+    columns = None
+    n_rows = 0
+    sums = pd.Series(dtype='float64')
+    counts = pd.Series(dtype='int64')
+    vocab_counts: Dict[str, pd.Series] = {}
+    seen_dtypes: Dict[str, set] = {}
+    categorical = set()
+    y_parts = []
+    sample = None
+    
+    for chunk in pd.read_csv(path, chunksize=chunksize, engine="c", dtype=dtype):
+        X = chunk.drop(columns=[target_col]) if target_col else chunk
+        if columns is None:
+            if target_col and target_col not in chunk.columns:
+                raise ValueError(f"Target column '{target_col}' not found in CSV")
+            columns = X.columns.tolist()
+            sample = X.head(100)
+        
+        if target_col:
+            y_parts.append(chunk[target_col].to_numpy())
+        numeric_cols, categorical_cols = _detect_columns(X)
+        numeric = X[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        sums = sums.add(numeric.sum(), fill_value=0)
+        counts = counts.add(numeric.count(), fill_value=0)
+        for col in categorical_cols:
+            vocab_counts[col] = vocab_counts.get(col, pd.Series(dtype='int64')).add(
+                X[col].value_counts(), fill_value=0)
+        categorical.update(categorical_cols)
+        for col in numeric_cols + categorical_cols:
+            seen_dtypes.setdefault(col, set()).add(str(X[col].dtype))
+        n_rows += len(chunk)
+    
+    if columns is None:
+        raise ValueError(f"CSV file '{path}' contains no rows")
+    
+    return {
+        'numeric_cols': [c for c in columns if c in seen_dtypes and c not in categorical],
+        'categorical_cols': [c for c in columns if c in categorical],
+        'mixed': [c for c in columns if c in categorical and len(seen_dtypes[c]) > 1],
+        'n_rows': n_rows,
+        'sums': sums,
+        'counts': counts,
+        'vocab_counts': vocab_counts,
+        'y': np.concatenate(y_parts) if target_col else None,
+        'sample': sample,
+    }
+
+
+def _encode_chunk(X: pd.DataFrame,
+                  numeric_cols: list,
+                  categorical_cols: list,
+                  fill_values: dict,
+                  encoders: dict,
+                  feature_names: list) -> np.ndarray:
+    """Fill and encode one chunk using statistics gathered on the first pass."""
+    parts = [X[numeric_cols].apply(pd.to_numeric, errors='coerce').fillna(fill_values)]
+    for col in categorical_cols:
+        values = X[col].fillna(fill_values[col])
+        enc = encoders[col]
+        if enc['type'] == 'onehot':
+            values = pd.Series(pd.Categorical(values, categories=enc['categories']), index=X.index)
+            parts.append(pd.get_dummies(values, prefix=col, drop_first=True))
+        else:
+            parts.append(pd.DataFrame({col: enc['encoder'].transform(values.astype(str))}, index=X.index))
+    return pd.concat(parts, axis=1)[feature_names].to_numpy(dtype=np.float32)
+
+
+def _build_streaming_column_transformer(sample: pd.DataFrame,
+                                        numeric_cols: list,
+                                        categorical_cols: list,
+                                        fill_values: dict,
+                                        encoders: dict,
+                                        scaler: StandardScaler) -> Pipeline:
+    """
+    Assemble the inference transformer from first-pass statistics.
+    
+    Mirrors ``_encode_chunk`` step for step. The encoders are given the
+    categories gathered over the whole file, so fitting on ``sample`` only
+    records the input column layout.
+    """
+    numeric_fill = {col: fill_values[col] for col in numeric_cols}
+    transformers = [('num', FunctionTransformer(pd.DataFrame.fillna, kw_args={'value': numeric_fill}), numeric_cols)]
+    for col in categorical_cols:
+        enc = encoders[col]
+        steps = [FunctionTransformer(pd.DataFrame.fillna, kw_args={'value': fill_values[col]})]
+        if enc['type'] == 'onehot':
+            steps.append(OneHotEncoder(categories=[enc['categories']], drop='first',
+                                       handle_unknown='ignore', sparse_output=False))
+        else:
+            steps += [FunctionTransformer(np.asarray, kw_args={'dtype': str}),
+                      OrdinalEncoder(categories=[enc['encoder'].classes_.tolist()],
+                                     handle_unknown='use_encoded_value', unknown_value=-1)]
+        transformers.append((col, make_pipeline(*steps), [col]))
+    column_transformer = ColumnTransformer(transformers, remainder='drop')
+    column_transformer.fit(sample)
+    return Pipeline([('columns', column_transformer), ('scaler', scaler)])
+
+
+def preprocess_tabular_streaming(path: str,
+                                 target_col: Optional[str] = None,
+                                 test_size: float = 0.2,
+                                 val_size: float = 0.1,
+                                 random_state: int = 42,
+                                 chunk_size_mb: float = 50,
+                                 memmap_dir: Optional[str] = None) -> Tuple[dict, Optional[np.ndarray]]:
+    """
+    Preprocess a tabular CSV that does not fit in memory by streaming it in chunks.
+    
+    Produces the same outputs as ``preprocess_tabular`` while keeping peak memory
+    bounded by ``chunk_size_mb`` instead of the dataset size.
+    
+    Steps:
+    1. First pass: detect column types over all chunks, accumulate numeric sums
+       and categorical vocabularies (used for mean/mode filling and encoder
+       fitting). Columns whose type changes between chunks are re-scanned as text.
+    2. Second pass: fill, encode and write each chunk to a ``np.memmap`` while
+       ``partial_fit``-ting the StandardScaler
+    3. Scale the memmap block by block and split into train/validation/test sets
+    
+    Parameters:
+    -----------
+    path : str
+        Path to the CSV file
+    target_col : str, optional
+        Name of the target column
+    test_size : float, default=0.2
+        Proportion of data for test set
+    val_size : float, default=0.1
+        Proportion of data for validation set (from training data)
+    random_state : int, default=42
+        Random seed for reproducibility
+    chunk_size_mb : float, default=50
+        Approximate in-memory size of each CSV chunk
+    memmap_dir : str, optional
+        Directory for the temporary memmap file (defaults to the system temp dir)
+        
+    Returns:
+    --------
+    data_splits : dict
+        Same keys as ``preprocess_tabular``. Feature matrices are float32.
+    y : np.ndarray or None
+        Full target array (if target_col provided)
+    """
+    logger.info("="*60)
+    logger.info("Starting streaming tabular data preprocessing...")
+    logger.info("="*60)
+    
+    chunksize = _rows_per_chunk(path, chunk_size_mb)
+    logger.info(f"✓ Reading '{path}' in chunks of {chunksize} rows (~{chunk_size_mb}MB)")
+    
+    # First pass; re-read once with mixed-type columns as text if any were found
+    dtype: Dict[str, type] = {}
+    scan = _scan_csv(path, chunksize, target_col, dtype)
+    if scan['mixed']:
+        logger.info(f"  • Re-scanning {len(scan['mixed'])} mixed-type column(s) as text: {scan['mixed']}")
+        dtype = {col: object for col in scan['mixed']}
+        scan = _scan_csv(path, chunksize, target_col, dtype)
+    numeric_cols = scan['numeric_cols']
+    categorical_cols = scan['categorical_cols']
+    n_rows = scan['n_rows']
+    y = scan['y']
+    
+    logger.info(f"\n📊 Column Detection:")
+    logger.info(f"  • Rows: {n_rows}")
+    logger.info(f"  • Numeric columns: {len(numeric_cols)}")
+    logger.info(f"  • Categorical columns: {len(categorical_cols)}")
+    
+    # Fill values and encoders from first-pass statistics
+    sums = scan['sums'].reindex(numeric_cols, fill_value=0.0)
+    counts = scan['counts'].reindex(numeric_cols, fill_value=0)
+    fill_values = (sums / counts.replace(0, np.nan)).fillna(0.0).to_dict()
+    encoders = {}
+    feature_names = list(numeric_cols)
+    for col in categorical_cols:
+        vc = scan['vocab_counts'][col]
+        # Ties go to the smallest value, as with DataFrame.mode
+        fill_values[col] = sorted(vc.index[vc == vc.max()], key=str)[0] if not vc.empty else 'missing'
+        categories = sorted(vc.index.tolist(), key=str) or ['missing']
+        if len(categories) <= 10:
+            columns = [f"{col}_{cat}" for cat in categories[1:]]
+            encoders[col] = {'type': 'onehot', 'columns': columns, 'categories': categories}
+            feature_names.extend(columns)
+        else:
+            le = LabelEncoder().fit([str(cat) for cat in categories])
+            encoders[col] = {'type': 'label', 'encoder': le}
+            feature_names.append(col)
+    
+    logger.info(f"\n✓ Total features after encoding: {len(feature_names)}")
+    
+    # Second pass: encode into a memmap while fitting the scaler incrementally
+    fd, mm_path = tempfile.mkstemp(suffix='.dat', dir=memmap_dir)
+    os.close(fd)
+    X_mm = None
+    try:
+        X_mm = np.memmap(mm_path, dtype=np.float32, mode='w+', shape=(n_rows, len(feature_names)))
+        scaler = StandardScaler()
+        start = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize, engine="c", dtype=dtype):
+            X = chunk.drop(columns=[target_col]) if target_col else chunk
+            block = _encode_chunk(X, numeric_cols, categorical_cols, fill_values, encoders, feature_names)
+            scaler.partial_fit(block)
+            X_mm[start:start + len(block)] = block
+            start += len(block)
+        
+        logger.info(f"\n⚖️  Scaling Features:")
+        logger.info(f"  • Using StandardScaler (partial_fit over {start} rows)")
+        for block_start in range(0, n_rows, chunksize):
+            block = slice(block_start, block_start + chunksize)
+            X_mm[block] = scaler.transform(X_mm[block])
+        X_mm.flush()
+        
+        # Split into train/val/test sets (materializes the final matrices)
+        logger.info(f"\n✂️  Splitting Data:")
+        logger.info(f"  • Test size: {test_size*100}%")
+        logger.info(f"  • Validation size: {val_size*100}%")
+        
+        indices = np.arange(n_rows)
+        val_size_adjusted = val_size / (1 - test_size)
+        if y is not None:
+            is_classification = len(np.unique(y)) < 20 and np.issubdtype(y.dtype, np.integer)
+            temp_idx, test_idx = train_test_split(
+                indices, test_size=test_size, random_state=random_state,
+                stratify=y if is_classification else None
+            )
+            train_idx, val_idx = train_test_split(
+                temp_idx, test_size=val_size_adjusted, random_state=random_state,
+                stratify=y[temp_idx] if is_classification else None
+            )
+        else:
+            temp_idx, test_idx = train_test_split(indices, test_size=test_size, random_state=random_state)
+            train_idx, val_idx = train_test_split(temp_idx, test_size=val_size_adjusted, random_state=random_state)
+        
+        X_train = np.asarray(X_mm[train_idx])
+        X_val = np.asarray(X_mm[val_idx])
+        X_test = np.asarray(X_mm[test_idx])
+    finally:
+        # Drop the mapping before removing its file (Windows cannot delete a mapped file)
+        del X_mm
+        os.remove(mm_path)
+    
+    column_transformer = _build_streaming_column_transformer(
+        scan['sample'], numeric_cols, categorical_cols, fill_values, encoders, scaler
+    )
+    
+    logger.info(f"\n✓ Split Complete:")
+    logger.info(f"  • Train: {X_train.shape}")
+    logger.info(f"  • Val:   {X_val.shape}")
+    logger.info(f"  • Test:  {X_test.shape}")
+    logger.info("="*60)
+    
+    data_splits = {
+        'X_train': X_train,
+        'X_val': X_val,
+        'X_test': X_test,
+        'feature_names': feature_names,
+        'scaler': scaler,
+        'encoders': encoders,
+        'column_transformer': column_transformer,
+        'numeric_cols': list(numeric_cols)
+    }
+    if y is not None:
+        data_splits.update({
+            'y_train': y[train_idx],
+            'y_val': y[val_idx],
+            'y_test': y[test_idx],
+        })
+    return data_splits, y
+
+
 if __name__ == "__main__":
     # Example usage
     print("\nTabular Preprocessing Module - Example Usage\n")
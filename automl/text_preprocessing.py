@@ -8,14 +8,21 @@ Date: December 2025
 Python Version: 3.10+
 """
 
+import functools
+import hashlib
 import logging
 import warnings
 import string
-from typing import Tuple, Optional
+from pathlib import Path
+from typing import Tuple, Optional, Union
+import joblib
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import ShuffleSplit, StratifiedShuffleSplit
+from joblib import Parallel, cpu_count, delayed
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +33,100 @@ logger = logging.getLogger(__name__)
 
 warnings.filterwarnings('ignore')
 
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_stopwords():
+    """
+    Load NLTK English stopwords once per process.
+    
+    Returns a tuple of stopwords, or the string 'english' (sklearn's built-in
+    list) when NLTK or its corpus is unavailable.
+    """
+    try:
+        import nltk
+        try:
+            from nltk.corpus import stopwords
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            logger.info("  • Downloading NLTK stopwords...")
+            nltk.download('stopwords', quiet=True)
+        
+        return tuple(stopwords.words('english'))
+    except Exception as e:
+        logger.warning(f"  • Could not load NLTK stopwords: {e}")
+        return 'english'
+
+
+def _parallel_hashing_tfidf(texts: list,
+                            n_features: int,
+                            stop_words,
+                            n_jobs: int) -> Tuple[sparse.csr_matrix, Pipeline]:
+    """
+    Hash document chunks in parallel, then fit IDF weights on the stacked matrix.
+    
+    Hashing is stateless, so chunks are transformed independently; only the IDF
+    pass needs the full corpus. Returns the TF-IDF matrix and a fitted Pipeline
+    that reproduces the transformation for new documents.
+    """
+    hasher = HashingVectorizer(
+        n_features=n_features,
+        stop_words=stop_words,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm=None
+    )
+    n_chunks = max(1, min(len(texts), cpu_count() if n_jobs < 0 else n_jobs))
+    bounds = np.linspace(0, len(texts), n_chunks + 1, dtype=int)
+    blocks = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(hasher.transform)(texts[start:end]) for start, end in zip(bounds[:-1], bounds[1:])
+    )
+    counts = sparse.vstack(blocks, format='csr')
+    tfidf = TfidfTransformer()
+    X = tfidf.fit_transform(counts)
+    return X, Pipeline([('hasher', hasher), ('tfidf', tfidf)])
+
+
+def _corpus_cache_key(texts: list, params: tuple) -> str:
+    """
+    Hash the cleaned corpus and vectorizer parameters into a short hex key.
+    
+    BLAKE2b is the fastest cryptographic hash in the stdlib; documents are fed
+    incrementally (NUL-separated) so the corpus is never joined in memory.
+    """
+    h = hashlib.blake2b(repr(params).encode(), digest_size=16)
+    for text in texts:
+        h.update(text.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _split_indices(n_samples: int,
+                   y: Optional[np.ndarray],
+                   test_size: float,
+                   val_size: float,
+                   random_state: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute train/val/test row indices without materializing intermediate splits.
+    
+    Uses the same splitters (and seeds) as ``train_test_split``, so the result is
+    identical to the previous two-stage split, but X is only sliced once per output.
+    """
+    val_size_adjusted = val_size / (1 - test_size)
+    placeholder = np.empty((n_samples, 1))
+    if y is not None:
+        outer = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+        temp_idx, test_idx = next(outer.split(placeholder, y))
+        inner = StratifiedShuffleSplit(n_splits=1, test_size=val_size_adjusted, random_state=random_state)
+        train_rel, val_rel = next(inner.split(placeholder[temp_idx], y[temp_idx]))
+    else:
+        outer = ShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+        temp_idx, test_idx = next(outer.split(placeholder))
+        inner = ShuffleSplit(n_splits=1, test_size=val_size_adjusted, random_state=random_state)
+        train_rel, val_rel = next(inner.split(placeholder[temp_idx]))
+    return temp_idx[train_rel], temp_idx[val_rel], test_idx
+
 
 def preprocess_text(df: pd.DataFrame,
                    text_col: str,
@@ -33,7 +134,10 @@ def preprocess_text(df: pd.DataFrame,
                    max_features: int = 5000,
                    test_size: float = 0.2,
                    val_size: float = 0.1,
-                   random_state: int = 42) -> Tuple[dict, Optional[np.ndarray]]:
+                   random_state: int = 42,
+                   return_dense: bool = False,
+                   n_jobs: Optional[int] = None,
+                   cache_dir: Optional[Union[str, Path]] = None) -> Tuple[dict, Optional[np.ndarray]]:
     """
     Preprocess text data using TF-IDF vectorization.
     
@@ -59,19 +163,33 @@ def preprocess_text(df: pd.DataFrame,
         Proportion of data for validation set
     random_state : int, default=42
         Random seed for reproducibility
+    return_dense : bool, default=False
+        Densify the TF-IDF matrix before splitting. By default the sparse CSR
+        matrix is kept, since TF-IDF output is overwhelmingly zeros.
+    n_jobs : int, optional
+        If set (e.g. -1), vectorize in parallel with a stateless HashingVectorizer
+        over document chunks followed by a TfidfTransformer. Feature names become
+        ``hash_<i>`` and min_df/max_df filtering is not applied. Default (None)
+        uses a single-threaded TfidfVectorizer.
+    cache_dir : str or Path, optional
+        Directory for memoizing fitted vectorizers (e.g. ``~/.cache/automl_tfidf``).
+        Keyed on a BLAKE2b hash of the cleaned corpus and vectorizer settings;
+        on a hit the stored vectorizer is loaded and only ``transform`` runs.
+        Disabled by default.
         
     Returns:
     --------
     data_splits : dict
         Dictionary containing:
-        - 'X_train': Training TF-IDF features
+        - 'X_train': Training TF-IDF features (scipy.sparse CSR unless return_dense)
         - 'X_val': Validation TF-IDF features
         - 'X_test': Test TF-IDF features
         - 'y_train': Training target (if target_col provided)
         - 'y_val': Validation target (if target_col provided)
         - 'y_test': Test target (if target_col provided)
-        - 'vectorizer': Fitted TfidfVectorizer object
+        - 'vectorizer': Fitted TfidfVectorizer (or hashing Pipeline when n_jobs is set)
         - 'feature_names': List of TF-IDF feature names
+        - 'text_col': Name of the text column (for inference)
     y : np.ndarray or None
         Full target array (if target_col provided)
         
@@ -85,11 +203,7 @@ def preprocess_text(df: pd.DataFrame,
     >>> result, y = preprocess_text(df, text_col='text', target_col='sentiment')
     >>> print(result['X_train'].shape)
     """
-    logger.info("="*60)
-    logger.info("Starting text data preprocessing...")
-    logger.info("="*60)
-    
-    df = df.copy()
+    logger.info("%s\nStarting text data preprocessing...\n%s", "="*60, "="*60)
     
     if text_col not in df.columns:
         raise ValueError(f"Text column '{text_col}' not found in DataFrame")
@@ -105,86 +219,69 @@ def preprocess_text(df: pd.DataFrame,
         logger.info("✓ No target column specified")
     
     # Get text data
-    texts = df[text_col].astype(str).tolist()
+    texts = df[text_col].astype(str)
     logger.info(f"✓ Processing {len(texts)} text samples")
     
-    # Clean text
-    logger.info(f"\n🧹 Cleaning Text:")
-    logger.info(f"  • Lowercase conversion")
-    logger.info(f"  • Punctuation removal")
-    logger.info(f"  • Whitespace normalization")
+    # Clean text (vectorized: lowercase, strip punctuation, collapse whitespace)
+    cleaned_texts = texts.str.lower().str.translate(_PUNCT_TABLE).str.split().str.join(' ').tolist()
+    logger.info("\n🧹 Cleaning Text: lowercase, punctuation removal, whitespace normalization ✓")
     
-    cleaned_texts = []
-    for text in texts:
-        # Lowercase
-        text = text.lower()
-        # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        cleaned_texts.append(text)
+    # TF-IDF Vectorization (includes tokenization and stopword removal)
+    stop_words = _get_stopwords()
+    if isinstance(stop_words, tuple):
+        stop_words_label = f"NLTK ({len(stop_words)} words)"
+        stop_words = list(stop_words)
+    else:
+        stop_words_label = "sklearn default"
+    logger.info("\n📊 TF-IDF Vectorization: max_features=%d, ngrams=(1, 2), min_df=2, "
+                "max_df=0.95, stopwords=%s", max_features, stop_words_label)
     
-    logger.info(f"✓ Text cleaning complete")
+    cache_path = None
+    if cache_dir is not None:
+        params = (max_features, (1, 2), 2, 0.95, stop_words, n_jobs is not None)
+        cache_path = Path(cache_dir).expanduser() / f"{_corpus_cache_key(cleaned_texts, params)}.joblib"
     
-    # TF-IDF Vectorization (includes tokenization and stopword removal)
-    logger.info(f"\n📊 TF-IDF Vectorization:")
-    logger.info(f"  • Max features: {max_features}")
-    logger.info(f"  • N-gram range: (1, 2) - unigrams and bigrams")
-    logger.info(f"  • Min document frequency: 2")
-    logger.info(f"  • Max document frequency: 0.95")
+    if cache_path is not None and cache_path.exists():
+        logger.info(f"  • Loading cached vectorizer: {cache_path}")
+        vectorizer = joblib.load(cache_path)
+        X = vectorizer.transform(cleaned_texts)
+    elif n_jobs is not None:
+        X, vectorizer = _parallel_hashing_tfidf(cleaned_texts, max_features, stop_words, n_jobs)
+    else:
+        vectorizer = TfidfVectorizer(
+            max_features=max_features,
+            stop_words=stop_words,
+            ngram_range=(1, 2),  # Include bigrams
+            min_df=2,  # Ignore terms that appear in fewer than 2 documents
+            max_df=0.95  # Ignore terms that appear in more than 95% of documents
+        )
+        X = vectorizer.fit_transform(cleaned_texts)
     
-    try:
-        # Try to use NLTK stopwords
-        import nltk
+    if cache_path is not None and not cache_path.exists():
         try:
-            from nltk.corpus import stopwords
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            logger.info("  • Downloading NLTK stopwords...")
-            nltk.download('stopwords', quiet=True)
-        
-        stop_words = stopwords.words('english')
-        logger.info(f"  • Using NLTK stopwords ({len(stop_words)} words)")
-    except Exception as e:
-        logger.warning(f"  • Could not load NLTK stopwords: {e}")
-        logger.info(f"  • Using sklearn's default stopwords")
-        stop_words = 'english'
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump(vectorizer, cache_path)
+            logger.info(f"  • Cached fitted vectorizer: {cache_path}")
+        except OSError as e:
+            logger.warning(f"  • Could not cache vectorizer: {e}")
     
-    vectorizer = TfidfVectorizer(
-        max_features=max_features,
-        stop_words=stop_words,
-        ngram_range=(1, 2),  # Include bigrams
-        min_df=2,  # Ignore terms that appear in fewer than 2 documents
-        max_df=0.95  # Ignore terms that appear in more than 95% of documents
-    )
-    
-    X = vectorizer.fit_transform(cleaned_texts).toarray()
-    logger.info(f"\n✓ TF-IDF transformation complete")
-    logger.info(f"  • Output shape: {X.shape}")
-    logger.info(f"  • Actual features: {X.shape[1]}")
+    if n_jobs is not None:
+        feature_names = [f"hash_{i}" for i in range(X.shape[1])]
+    else:
+        feature_names = vectorizer.get_feature_names_out().tolist()
+    if return_dense:
+        X = X.toarray()
+    logger.info("✓ TF-IDF transformation complete: output shape %s", X.shape)
     
     # Split into train/val/test sets
-    logger.info(f"\n✂️  Splitting Data:")
-    logger.info(f"  • Test size: {test_size*100}%")
-    logger.info(f"  • Validation size: {val_size*100}%")
+    train_idx, val_idx, test_idx = _split_indices(X.shape[0], y, test_size, val_size, random_state)
+    X_train, X_val, X_test = X[train_idx], X[val_idx], X[test_idx]
+    logger.info("\n✂️  Split Complete (test=%.0f%%, val=%.0f%%):\n  • Train: %s\n  • Val:   %s\n"
+                "  • Test:  %s\n%s", test_size*100, val_size*100,
+                X_train.shape, X_val.shape, X_test.shape, "="*60)
     
     if y is not None:
-        # First split: train+val and test
-        X_temp, X_test, y_temp, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
-        )
-        
-        # Second split: train and val
-        val_size_adjusted = val_size / (1 - test_size)
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_temp, y_temp, test_size=val_size_adjusted, random_state=random_state, stratify=y_temp
-        )
-        
-        logger.info(f"\n✓ Split Complete:")
-        logger.info(f"  • Train: {X_train.shape}")
-        logger.info(f"  • Val:   {X_val.shape}")
-        logger.info(f"  • Test:  {X_test.shape}")
-        logger.info("="*60)
+        y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
         
         return {
             'X_train': X_train,
@@ -194,31 +291,17 @@ def preprocess_text(df: pd.DataFrame,
             'y_val': y_val,
             'y_test': y_test,
             'vectorizer': vectorizer,
-            'feature_names': vectorizer.get_feature_names_out().tolist()
+            'feature_names': feature_names,
+            'text_col': text_col
         }, y
     else:
-        # Unsupervised
-        X_temp, X_test = train_test_split(
-            X, test_size=test_size, random_state=random_state
-        )
-        
-        val_size_adjusted = val_size / (1 - test_size)
-        X_train, X_val = train_test_split(
-            X_temp, test_size=val_size_adjusted, random_state=random_state
-        )
-        
-        logger.info(f"\n✓ Split Complete:")
-        logger.info(f"  • Train: {X_train.shape}")
-        logger.info(f"  • Val:   {X_val.shape}")
-        logger.info(f"  • Test:  {X_test.shape}")
-        logger.info("="*60)
-        
         return {
             'X_train': X_train,
             'X_val': X_val,
             'X_test': X_test,
             'vectorizer': vectorizer,
-            'feature_names': vectorizer.get_feature_names_out().tolist()
+            'feature_names': feature_names,
+            'text_col': text_col
         }, None
 
 
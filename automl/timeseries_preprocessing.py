@@ -16,6 +16,8 @@ import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 
+from ._lag_kernel import NUMBA_LAG_THRESHOLD, fill_lags
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,12 +28,34 @@ logger = logging.getLogger(__name__)
 warnings.filterwarnings('ignore')
 
 
+def _lag_matrix(arr: np.ndarray, n_lags: int) -> np.ndarray:
+    """
+    Build all lag features of an (N, C) block in one pass.
+    
+    Returns an (N, C * n_lags) array ordered as col_0 lags 1..n_lags, col_1 lags
+    1..n_lags, ...; the first rows are NaN where a lag reaches before the start.
+    Very large inputs use the numba kernel from ``_lag_kernel`` when available.
+    """
+    n_rows, n_cols = arr.shape
+    if fill_lags is not None and n_rows * n_cols * n_lags > NUMBA_LAG_THRESHOLD:
+        out = np.empty((n_rows, n_cols * n_lags), dtype=arr.dtype)
+        fill_lags(np.ascontiguousarray(arr), out, n_lags)
+        return out
+    
+    padded = np.pad(arr, ((n_lags, 0), (0, 0)), constant_values=np.nan)
+    # windows[i, c, j] == padded[i + j, c], so lag L sits at j == n_lags - L
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window_shape=n_lags + 1, axis=0)
+    return windows[:, :, n_lags - 1::-1].reshape(n_rows, -1)
+
+
 def preprocess_timeseries(df: pd.DataFrame,
                          target_col: Optional[str] = None,
                          time_col: Optional[str] = None,
                          n_lags: int = 3,
                          test_size: float = 0.2,
-                         val_size: float = 0.1) -> Tuple[dict, Optional[np.ndarray]]:
+                         val_size: float = 0.1,
+                         dtype: type = np.float32,
+                         fit_on_train_only: bool = True) -> Tuple[dict, Optional[np.ndarray]]:
     """
     Preprocess time series data with lag features.
     
@@ -56,6 +80,13 @@ def preprocess_timeseries(df: pd.DataFrame,
         Proportion of data for test set
     val_size : float, default=0.1
         Proportion of data for validation set
+    dtype : type, default=np.float32
+        Dtype of the returned feature matrices. Pass np.float64 to opt back
+        into double precision. Scaler statistics are still accumulated in
+        float64 internally by sklearn.
+    fit_on_train_only : bool, default=True
+        Fit the scaler on the training slice only (no leakage, smaller working
+        set). Set to False to reproduce the legacy fit on all samples.
         
     Returns:
     --------
@@ -90,28 +121,31 @@ def preprocess_timeseries(df: pd.DataFrame,
     >>> result, y = preprocess_timeseries(df, target_col='target', time_col='date')
     >>> print(result['X_train'].shape)
     """
-    logger.info("="*60)
-    logger.info("Starting time series data preprocessing...")
-    logger.info("="*60)
-    
-    df = df.copy()
+    logger.info("%s\nStarting time series data preprocessing...\n%s", "="*60, "="*60)
     
     # Sort by time if time_col is provided
     if time_col:
         if time_col not in df.columns:
             raise ValueError(f"Time column '{time_col}' not found in DataFrame")
         
-        logger.info(f"\n📅 Time Column Processing:")
-        logger.info(f"  • Sorting by: '{time_col}'")
-        df[time_col] = pd.to_datetime(df[time_col])
-        df = df.sort_values(by=time_col).reset_index(drop=True)
+        # Parsed timestamps stay local; the caller's DataFrame is never mutated
+        time_series = pd.to_datetime(df[time_col]).reset_index(drop=True)
+        if time_series.is_monotonic_increasing:
+            # O(N) check; skips the O(N log N) sort and its full copy
+            sort_note = f"already sorted by '{time_col}', skipping sort_values"
+        else:
+            sort_note = f"sorted by '{time_col}'"
+            time_series = time_series.sort_values()
+            df = df.iloc[time_series.index.to_numpy()].reset_index(drop=True)
+            time_series = time_series.reset_index(drop=True)
         
         # Handle missing timestamps with interpolation
-        if df[time_col].isnull().any():
-            logger.info(f"  • Interpolating missing timestamps")
-            df[time_col] = df[time_col].interpolate(method='time')
+        if time_series.isnull().any():
+            sort_note += ", interpolated missing timestamps"
+            time_series = time_series.interpolate(method='time')
         
-        logger.info(f"✓ Time range: {df[time_col].min()} to {df[time_col].max()}")
+        logger.info("\n📅 Time Column: %s\n✓ Time range: %s to %s",
+                    sort_note, time_series.min(), time_series.max())
     else:
         logger.info("✓ No time column specified, assuming data is already sorted")
     
@@ -131,93 +165,81 @@ def preprocess_timeseries(df: pd.DataFrame,
     
     # Detect numeric columns for lag features
     numeric_cols = X_df.select_dtypes(include=['int64', 'float64', 'int32', 'float32']).columns.tolist()
-    logger.info(f"\n📊 Feature Detection:")
-    logger.info(f"  • Numeric columns: {len(numeric_cols)}")
-    logger.info(f"  • Total features: {len(feature_cols)}")
+    logger.info("\n📊 Feature Detection: %d numeric of %d total features",
+                len(numeric_cols), len(feature_cols))
     
     # Handle missing values in numeric columns before creating lags
-    logger.info(f"\n🔧 Handling Missing Values:")
-    missing_handled = 0
-    for col in numeric_cols:
-        if X_df[col].isnull().any():
-            logger.info(f"  • {col}: interpolating missing values")
-            X_df[col] = X_df[col].interpolate(method='linear').fillna(method='bfill').fillna(method='ffill')
-            missing_handled += 1
+    mask = X_df[numeric_cols].isnull().any()
+    cols_to_fix = mask[mask].index.tolist()
+    if cols_to_fix:
+        # limit_direction='both' also covers leading/trailing NaNs (former bfill/ffill pair)
+        X_df[cols_to_fix] = X_df[cols_to_fix].interpolate(method='linear', limit_direction='both', axis=0)
     
-    if missing_handled == 0:
-        logger.info(f"  • No missing values found")
-    else:
-        logger.info(f"✓ Handled {missing_handled} columns with missing values")
+    logger.info("\n🔧 Missing Values: interpolated %d columns", len(cols_to_fix))
+    if cols_to_fix and logger.isEnabledFor(logging.DEBUG):
+        for col in cols_to_fix:
+            logger.debug("  • %s: interpolated (linear)", col)
     
     # Create lag features
-    logger.info(f"\n🔄 Creating Lag Features:")
-    logger.info(f"  • Number of lags: {n_lags}")
-    logger.info(f"  • Columns to lag: {len(numeric_cols)}")
-    
-    lag_features = []
-    lag_feature_names = []
-    
-    for col in numeric_cols:
-        for lag in range(1, n_lags + 1):
-            lag_col_name = f"{col}_lag_{lag}"
-            X_df[lag_col_name] = X_df[col].shift(lag)
-            lag_feature_names.append(lag_col_name)
-    
-    logger.info(f"✓ Created {len(lag_feature_names)} lag features")
+    lag_feature_names = [f"{col}_lag_{lag}" for col in numeric_cols for lag in range(1, n_lags + 1)]
+    if lag_feature_names:
+        # One concat keeps the BlockManager consolidated (no per-column inserts)
+        lag_df = pd.DataFrame(
+            _lag_matrix(X_df[numeric_cols].to_numpy(dtype=np.float64), n_lags),
+            columns=lag_feature_names,
+            index=X_df.index
+        )
+        X_df = pd.concat([X_df, lag_df], axis=1)
     
-    # Drop rows with NaN values created by lag features
-    initial_rows = len(X_df)
-    X_df = X_df.dropna()
-    
-    if y_series is not None:
-        y_series = y_series.loc[X_df.index]
-    
-    dropped_rows = initial_rows - len(X_df)
-    logger.info(f"  • Dropped {dropped_rows} rows with NaN from lag features")
-    logger.info(f"  • Remaining rows: {len(X_df)}")
-    
-    # Reset index
-    X_df = X_df.reset_index(drop=True)
+    # Lags leave NaN only in the first n_lags rows (other gaps were interpolated
+    # above), so a positional slice replaces a full-matrix dropna scan
+    n_drop = min(n_lags, len(X_df)) if lag_feature_names else 0
+    X_df = X_df.iloc[n_drop:].reset_index(drop=True)
     if y_series is not None:
-        y_series = y_series.reset_index(drop=True)
+        y_series = y_series.iloc[n_drop:].reset_index(drop=True)
         y = y_series.values
     else:
         y = None
     
-    feature_names = X_df.columns.tolist()
-    # Split into train/val/test sets (preserving temporal order)
-    logger.info(f"\n✂️  Temporal Splitting:")
-    logger.info(f"  • Test size: {test_size*100}%")
-    logger.info(f"  • Validation size: {val_size*100}%")
-    logger.info(f"  • Note: Preserving temporal order (no shuffling)")
+    logger.info("\n🔄 Lag Features: %d lags x %d columns = %d features; "
+                "dropped %d leading rows, %d remaining",
+                n_lags, len(numeric_cols), len(lag_feature_names), n_drop, len(X_df))
     
-    n_samples = len(X_scaled)
+    feature_names = X_df.columns.tolist()
+    # Split into train/val/test sets (preserving temporal order, no shuffling)
+    X_arr = X_df.to_numpy(dtype=dtype, copy=False)
+    n_samples = X_arr.shape[0]
     test_start_idx = int(n_samples * (1 - test_size))
     val_start_idx = int(test_start_idx * (1 - val_size / (1 - test_size)))
-    
-    X_train_raw = X_df.iloc[:val_start_idx].to_numpy()
-    X_val_raw = X_df.iloc[val_start_idx:test_start_idx].to_numpy()
-    X_test_raw = X_df.iloc[test_start_idx:].to_numpy()
 
-    # Scale features after split to avoid leakage
-    logger.info(f"\n⚖️  Scaling Features:")
-    logger.info(f"  • Using StandardScaler (fit on train, transform val/test)")
-    scaler = StandardScaler()
-    X_train = scaler.fit_transform(X_train_raw)
-    X_val = scaler.transform(X_val_raw)
-    X_test = scaler.transform(X_test_raw)
+    # Scale features after split to avoid leakage (in place on row-slice views)
+    scaler = StandardScaler(copy=False)
+    if fit_on_train_only:
+        scaler.fit(X_arr[:val_start_idx])
+    else:
+        scaler.fit(X_arr)
+    X_train = scaler.transform(X_arr[:val_start_idx])
+    X_val = scaler.transform(X_arr[val_start_idx:test_start_idx])
+    X_test = scaler.transform(X_arr[test_start_idx:])
+    # The fitted scaler is returned in the splits; later transforms must not
+    # overwrite the caller's arrays
+    scaler.set_params(copy=True)
+    
+    logger.info("\n⚖️  StandardScaler fit on %s\n✂️  Temporal Split Complete "
+                "(test=%.0f%%, val=%.0f%%):\n"
+                "  • Train: %s (indices 0-%d)\n  • Val:   %s (indices %d-%d)\n"
+                "  • Test:  %s (indices %d-%d)\n%s",
+                "train only" if fit_on_train_only else "all samples",
+                test_size*100, val_size*100,
+                X_train.shape, val_start_idx - 1,
+                X_val.shape, val_start_idx, test_start_idx - 1,
+                X_test.shape, test_start_idx, n_samples - 1, "="*60)
     
     if y is not None:
         y_train = y[:val_start_idx]
         y_val = y[val_start_idx:test_start_idx]
         y_test = y[test_start_idx:]
         
-        logger.info(f"\n✓ Split Complete:")
-        logger.info(f"  • Train: {X_train.shape} (indices 0-{val_start_idx-1})")
-        logger.info(f"  • Val:   {X_val.shape} (indices {val_start_idx}-{test_start_idx-1})")
-        logger.info(f"  • Test:  {X_test.shape} (indices {test_start_idx}-{n_samples-1})")
-        logger.info("="*60)
-        
         return {
             'X_train': X_train,
             'X_val': X_val,
@@ -230,12 +252,6 @@ def preprocess_timeseries(df: pd.DataFrame,
             'n_lags': n_lags
         }, y
     else:
-        logger.info(f"\n✓ Split Complete:")
-        logger.info(f"  • Train: {X_train.shape} (indices 0-{val_start_idx-1})")
-        logger.info(f"  • Val:   {X_val.shape} (indices {val_start_idx}-{test_start_idx-1})")
-        logger.info(f"  • Test:  {X_test.shape} (indices {test_start_idx}-{n_samples-1})")
-        logger.info("="*60)
-        
         return {
             'X_train': X_train,
             'X_val': X_val,
@@ -11,14 +11,29 @@ Python Version: 3.10+
 
 import json
 import logging
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional
 from uuid import uuid4
 from datetime import datetime
+from functools import partial
 
 import joblib
 import numpy as np
 
+try:  # lz4 is optional; joblib falls back to zlib compression without it
+    import lz4.frame  # noqa: F401
+    DEFAULT_COMPRESS: Any = ("lz4", 3)
+except ImportError:  # pragma: no cover - environment dependent
+    DEFAULT_COMPRESS = 3
+
+try:  # orjson is optional; falls back to the stdlib json encoder
+    import orjson
+except ImportError:  # pragma: no cover - environment dependent
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +42,47 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """Convert NumPy scalars and arrays for the stdlib ``json`` fallback."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(data: Dict[str, Any], path: Path) -> None:
+    """Write ``data`` as indented JSON, using orjson when available.
+    
+    orjson serializes NumPy scalars and arrays natively, so callers do not
+    need to cast metrics to Python floats first.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            ))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=_json_default)
+
+
+def _atomic_dump(obj: Any, path: Path, dumper) -> None:
+    """Write ``obj`` via ``dumper(obj, tmp_path)`` and rename it into place.
+    
+    ``os.replace`` is atomic within a filesystem, so a crash mid-write leaves
+    the previous file (or none) instead of a truncated pickle.
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        dumper(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def generate_run_id() -> str:
     """Generate a unique run ID combining timestamp and UUID.
     
@@ -77,6 +133,8 @@ def save_artifacts(
     metrics: Optional[Dict[str, Any]] = None,
     feature_metadata: Optional[Dict[str, Any]] = None,
     base_dir: Path = None,
+    compress: Any = DEFAULT_COMPRESS,
+    mmap_friendly: bool = False,
 ) -> Dict[str, str]:
     """Save trained model and preprocessing artifacts to disk.
     
@@ -109,6 +167,12 @@ def save_artifacts(
         - 'selected_count': Number of selected features (if feature selection applied)
     base_dir : Path, optional
         Base directory for artifacts. Defaults to 'artifacts/'.
+    compress : Any, optional
+        joblib compression for the pickles. Defaults to ('lz4', 3) when lz4 is
+        installed, otherwise zlib level 3. ``joblib.load`` detects it automatically.
+    mmap_friendly : bool, default=False
+        Force ``compress=0`` so the pickles can be loaded with
+        ``load_artifacts(..., mmap_mode='r')`` for zero-copy inference.
     
     Returns
     -------
@@ -141,6 +205,9 @@ def save_artifacts(
     if base_dir is None:
         base_dir = Path("artifacts")
     
+    if mmap_friendly:
+        compress = 0
+    
     # Create artifacts directory
     artifacts_dir = create_artifacts_directory(base_dir, run_id)
     
@@ -150,72 +217,57 @@ def save_artifacts(
     feature_metadata_path = artifacts_dir / "feature_metadata.json"
     metrics_path = artifacts_dir / "metrics.json"
     
-    # 1. Save model using joblib
-    try:
-        joblib.dump(model, model_path, protocol=4)
-        logger.info(f"Model persisted at: {model_path}")
-    except Exception as e:
-        logger.error(f"Failed to save model: {e}")
-        raise
-    
-    # 2. Save preprocessing artifacts using joblib
-    if preprocessors:
-        try:
-            joblib.dump(preprocessors, preprocessing_path, protocol=4)
-            logger.info(f"Preprocessing artifacts saved: {preprocessing_path}")
-        except Exception as e:
-            logger.error(f"Failed to save preprocessors: {e}")
-            raise
-    
-    # 3. Save feature metadata as JSON
     feature_metadata = feature_metadata or {}
-    try:
-        with open(feature_metadata_path, 'w') as f:
-            json.dump(feature_metadata, f, indent=2)
-        logger.info(f"Feature metadata saved: {feature_metadata_path}")
-    except Exception as e:
-        logger.error(f"Failed to save feature metadata: {e}")
-        raise
-    
-    # 4. Save metrics as JSON
     metrics = metrics or {}
-    try:
-        with open(metrics_path, 'w') as f:
-            json.dump(metrics, f, indent=2)
-        logger.info(f"Metrics saved: {metrics_path}")
-    except Exception as e:
-        logger.error(f"Failed to save metrics: {e}")
-        raise
+    dump = partial(joblib.dump, compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    # The writes are independent I/O, so overlap them on a thread pool.
+    # Each entry: (artifact name, success message, zero-argument callable)
+    # Every write goes to its own .tmp sibling first, so threads never collide.
+    tasks = [("model", f"Model persisted at: {model_path}",
+              partial(_atomic_dump, model, model_path, dump))]
+    if preprocessors:
+        tasks.append(("preprocessors", f"Preprocessing artifacts saved: {preprocessing_path}",
+                      partial(_atomic_dump, preprocessors, preprocessing_path, dump)))
+    tasks.append(("feature metadata", f"Feature metadata saved: {feature_metadata_path}",
+                  partial(_atomic_dump, feature_metadata, feature_metadata_path, write_json)))
+    tasks.append(("metrics", f"Metrics saved: {metrics_path}",
+                  partial(_atomic_dump, metrics, metrics_path, write_json)))
+    
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [(name, message, executor.submit(task)) for name, message, task in tasks]
+        for name, message, future in futures:
+            try:
+                future.result()
+                logger.info(message)
+            except Exception as e:
+                logger.error(f"Failed to save {name}: {e}")
+                raise
     
     logger.info("Artifacts saved successfully")
     
     # Return relative paths for portability
+    cwd = Path.cwd()
+    paths = {
+        "artifacts_dir": artifacts_dir,
+        "model_path": model_path,
+        "preprocessing_path": preprocessing_path,
+        "feature_metadata_path": feature_metadata_path,
+        "metrics_path": metrics_path,
+    }
     try:
-        artifacts_rel = artifacts_dir.relative_to(Path.cwd())
-        model_rel = model_path.relative_to(Path.cwd())
-        preprocessing_rel = preprocessing_path.relative_to(Path.cwd())
-        feature_metadata_rel = feature_metadata_path.relative_to(Path.cwd())
-        metrics_rel = metrics_path.relative_to(Path.cwd())
+        paths = {key: path.relative_to(cwd) for key, path in paths.items()}
     except ValueError:
         # If relative_to fails, use absolute paths
-        artifacts_rel = artifacts_dir
-        model_rel = model_path
-        preprocessing_rel = preprocessing_path
-        feature_metadata_rel = feature_metadata_path
-        metrics_rel = metrics_path
-    
-    return {
-        "artifacts_dir": str(artifacts_rel).replace("\\", "/"),
-        "model_path": str(model_rel).replace("\\", "/"),
-        "preprocessing_path": str(preprocessing_rel).replace("\\", "/"),
-        "feature_metadata_path": str(feature_metadata_rel).replace("\\", "/"),
-        "metrics_path": str(metrics_rel).replace("\\", "/"),
-    }
+        pass
+    
+    return {key: path.as_posix() for key, path in paths.items()}
 
 
 def load_artifacts(
     run_id: str,
     base_dir: Path = None,
+    mmap_mode: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Load previously saved model and preprocessing artifacts.
     
@@ -225,6 +277,11 @@ def load_artifacts(
         Unique identifier for the training run.
     base_dir : Path, optional
         Base directory where artifacts are stored. Defaults to 'artifacts/'.
+    mmap_mode : str, optional
+        Passed to ``joblib.load``. Use ``'r'`` to memory-map NumPy arrays so
+        inference workers share read-only pages via the OS page cache. Requires
+        artifacts saved uncompressed (``save_artifacts(..., mmap_friendly=True)``);
+        joblib loads compressed pickles fully into memory.
     
     Returns
     -------
@@ -260,7 +317,7 @@ def load_artifacts(
     model_path = artifacts_dir / "model.pkl"
     if model_path.exists():
         try:
-            result['model'] = joblib.load(model_path)
+            result['model'] = joblib.load(model_path, mmap_mode=mmap_mode)
             logger.info(f"Model loaded from: {model_path}")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
@@ -272,7 +329,7 @@ def load_artifacts(
     preprocessing_path = artifacts_dir / "preprocessing.pkl"
     if preprocessing_path.exists():
         try:
-            result['preprocessors'] = joblib.load(preprocessing_path)
+            result['preprocessors'] = joblib.load(preprocessing_path, mmap_mode=mmap_mode)
             logger.info(f"Preprocessors loaded from: {preprocessing_path}")
         except Exception as e:
             logger.error(f"Failed to load preprocessors: {e}")
@@ -308,4 +365,5 @@ __all__ = [
     "create_artifacts_directory",
     "save_artifacts",
     "load_artifacts",
+    "write_json",
 ]
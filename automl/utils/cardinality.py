@@ -0,0 +1,87 @@
+"""
+Cardinality Checks
+==================
+Numba-compiled checks used by task-type inference. Without numba a chunked
+NumPy implementation with the same early-exit behaviour is used instead.
+
+Author: AutoML System
+Date: December 2025
+Python Version: 3.10+
+"""
+
+import numpy as np
+
+try:  # numba is optional; the NumPy fallback below is used without it
+    from numba import njit
+except ImportError:  # pragma: no cover - environment dependent
+    njit = None
+
+# Fibonacci hashing multiplier (2**64 / golden ratio)
+_HASH_MULTIPLIER = np.uint64(11400714819323198485)
+
+
+def _to_keys(arr: np.ndarray) -> np.ndarray:
+    """Map numeric values to int64 keys, dropping NaN (as ``nunique`` does)."""
+    arr = np.asarray(arr)
+    if arr.dtype.kind in "biu":
+        return arr.astype(np.int64, copy=False)
+    values = arr.astype(np.float64, copy=False)
+    values = values[~np.isnan(values)] + 0.0  # + 0.0 folds -0.0 into 0.0
+    return values.view(np.int64)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _cardinality_at_least_jit(keys, threshold):  # pragma: no cover - compiled
+        """Open-addressed hash-set scan that stops once ``threshold`` distinct keys are seen."""
+        bits = 1
+        while (1 << bits) < 2 * threshold:
+            bits += 1
+        size = 1 << bits
+        shift = np.uint64(64 - bits)
+        table = np.empty(size, np.int64)
+        used = np.zeros(size, np.bool_)
+        count = 0
+        for i in range(keys.shape[0]):
+            key = keys[i]
+            slot = np.int64((np.uint64(key) * _HASH_MULTIPLIER) >> shift)
+            while used[slot] and table[slot] != key:
+                slot = (slot + 1) & (size - 1)
+            if not used[slot]:
+                used[slot] = True
+                table[slot] = key
+                count += 1
+                if count >= threshold:
+                    return True
+        return False
+else:  # pragma: no cover - environment dependent
+    _cardinality_at_least_jit = None
+
+
+def _cardinality_at_least_numpy(keys: np.ndarray, threshold: int) -> bool:
+    """Chunked fallback: union per-block uniques and stop once ``threshold`` is reached."""
+    seen: set = set()
+    block = max(4 * threshold, 4096)
+    for start in range(0, keys.shape[0], block):
+        seen.update(np.unique(keys[start:start + block]).tolist())
+        if len(seen) >= threshold:
+            return True
+    return False
+
+
+def cardinality_at_least(arr: np.ndarray, threshold: int) -> bool:
+    """Return True if ``arr`` holds at least ``threshold`` distinct non-NaN values.
+
+    Only the prefix needed to reach ``threshold`` distinct values is scanned,
+    so high-cardinality columns exit after O(first-k-distinct) work instead of
+    hashing every row.
+    """
+    if threshold <= 0:
+        return True
+    keys = _to_keys(arr)
+    if _cardinality_at_least_jit is not None:
+        return bool(_cardinality_at_least_jit(keys, threshold))
+    return _cardinality_at_least_numpy(keys, threshold)
+
+
+__all__ = ["cardinality_at_least"]
@@ -1,26 +1,86 @@
 """Dataset sampling utilities for the AutoML system.
 
-Provides a reusable helper to downsample large datasets while preserving
-class distribution for classification tasks.
+Provides reusable helpers to downsample large datasets, in memory or while
+streaming a CSV, preserving class distribution for classification tasks.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 logger = logging.getLogger(__name__)
 
+# Above this sampled fraction a positional take beats a boolean-mask gather
+TAKE_RATIO_THRESHOLD = 0.1
+
+# Above this sampled fraction stratification is skipped: dropping a few
+# random rows barely moves the class proportions
+NEAR_FULL_RATIO = 0.95
+
+
+def _index_dtype(n_rows: int) -> type:
+    """Smallest integer dtype that can address ``n_rows`` positions."""
+    return np.int32 if n_rows <= np.iinfo(np.int32).max else np.int64
+
+
+def _allocate_quotas(counts: np.ndarray, n: int) -> np.ndarray:
+    """Split ``n`` draws across classes proportionally to ``counts``.
+
+    Uses largest-remainder rounding so the quotas sum exactly to ``n``.
+    """
+    exact = counts * (n / counts.sum())
+    quotas = np.floor(exact).astype(np.int64)
+    shortfall = n - int(quotas.sum())
+    if shortfall > 0:
+        quotas[np.argsort(quotas - exact, kind="stable")[:shortfall]] += 1
+    return quotas
+
+
+def _stratified_sample_indices(
+    y: pd.Series, n: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw ``n`` row positions from ``y`` preserving its class proportions."""
+    # factorize hashes labels in one C pass; missing labels form their own class
+    codes, _ = pd.factorize(y.to_numpy(), sort=False, use_na_sentinel=False)
+    counts = np.bincount(codes)
+    quotas = _allocate_quotas(counts, n)
+
+    # Classes whose quota covers every row (typically rare minorities) are
+    # kept whole; only the remaining rows need to be shuffled
+    dtype = _index_dtype(len(codes))
+    whole = quotas >= counts
+    kept = np.flatnonzero(whole[codes]).astype(dtype, copy=False)
+    if whole.all():
+        return kept
+
+    # One global permutation of the partial-class rows, grouped by class with
+    # a stable sort, so each class's rows appear in random order and its first
+    # ``quota`` are kept
+    rest = np.flatnonzero(~whole[codes]).astype(dtype, copy=False)
+    # rest is a fresh array, so shuffle it in place rather than gathering it
+    # through a separate permutation index
+    perm = rng.permuted(rest, out=rest)
+    by_class = perm[np.argsort(codes[perm], kind="stable")]
+    partial_counts = np.where(whole, 0, counts)
+    starts = np.concatenate(([0], np.cumsum(partial_counts)[:-1]))
+    return np.concatenate([kept] + [
+        by_class[start:start + quota]
+        for start, quota, full in zip(starts, quotas, whole)
+        if not full
+    ])
+
 
 def sample_dataset(
     df: pd.DataFrame,
     target_col: Optional[str],
     max_rows: int = 5000,
     task_type: Optional[str] = None,
-    random_state: int = 42,
+    random_state: Union[int, np.random.Generator, None] = 42,
 ) -> pd.DataFrame:
     """Return a sampled view of ``df`` constrained by ``max_rows``.
 
@@ -28,9 +88,12 @@ def sample_dataset(
       returned unchanged.
     - For classification tasks with a valid ``target_col``, a stratified sample
       is produced to preserve class distribution.
-    - Otherwise, a random sample is drawn.
+    - Otherwise, or when ``max_rows`` keeps more than ``NEAR_FULL_RATIO`` of
+      the rows, a random sample is drawn.
 
     Sampling uses in-memory operations only and does not perform any file I/O.
+    Draws come from a PCG64 ``numpy.random.Generator`` seeded with
+    ``random_state``; an existing Generator may be passed instead of a seed.
     """
 
     original_rows = len(df)
@@ -40,17 +103,127 @@ def sample_dataset(
         logger.info("Sampling skipped: returning original dataset")
         return df
 
-    if task_type == "classification" and target_col and target_col in df.columns:
-        stratify_series = df[target_col]
-        sample_df, _ = train_test_split(
-            df,
-            train_size=max_rows,
-            stratify=stratify_series,
-            random_state=random_state,
-        )
-        logger.info("Stratified sample created: sampled_rows=%d", len(sample_df))
-        return sample_df.reset_index(drop=True)
-
-    sample_df = df.sample(n=max_rows, random_state=random_state)
-    logger.info("Random sample created: sampled_rows=%d", len(sample_df))
-    return sample_df.reset_index(drop=True)
+    rng = np.random.default_rng(random_state)
+    if max_rows / original_rows > NEAR_FULL_RATIO:
+        # Draw the few rows to drop rather than the many to keep
+        mask = np.ones(original_rows, dtype=bool)
+        mask[rng.choice(original_rows, size=original_rows - max_rows, replace=False)] = False
+        sample_df = df[mask]
+        sample_df.index = pd.RangeIndex(len(sample_df))
+        logger.info("Near-full random sample created: sampled_rows=%d", len(sample_df))
+        return sample_df
+
+    stratified = task_type == "classification" and target_col and target_col in df.columns
+    if stratified:
+        sampled = _stratified_sample_indices(df[target_col], max_rows, rng)
+    else:
+        sampled = rng.choice(original_rows, size=max_rows, replace=False)
+        sampled = sampled.astype(_index_dtype(original_rows), copy=False)
+
+    # Both gathers keep the original row order; int32 positions halve the
+    # index bandwidth of the take, while sparse samples favour the mask
+    if max_rows / original_rows > TAKE_RATIO_THRESHOLD:
+        sample_df = df.take(np.sort(sampled))
+    else:
+        mask = np.zeros(original_rows, dtype=bool)
+        mask[sampled] = True
+        sample_df = df[mask]
+    # The gather already produced a new frame, so rebinding its index in place
+    # avoids the extra column copy reset_index makes without copy-on-write
+    sample_df.index = pd.RangeIndex(len(sample_df))
+    logger.info(
+        "%s sample created: sampled_rows=%d",
+        "Stratified" if stratified else "Random",
+        len(sample_df),
+    )
+    return sample_df
+
+
+def _rank_within_class(labels: pd.Series, keys: np.ndarray) -> np.ndarray:
+    """1-based rank of each row's key among rows of the same class.
+
+    One factorize plus one lexsort; avoids a pandas groupby for the per-class
+    reservoir cut. Missing labels form their own class.
+    """
+    codes, _ = pd.factorize(labels.to_numpy(), use_na_sentinel=False)
+    order = np.lexsort((keys, codes))
+    sorted_codes = codes[order]
+    positions = np.arange(len(order))
+    # Position of each row's class block start, carried forward through the block
+    block_start = np.where(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]], positions, 0)
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = positions - np.maximum.accumulate(block_start) + 1
+    return ranks
+
+
+def _count_classes(path: Union[str, Path], target_col: str, chunksize: int) -> pd.Series:
+    """Count target labels (missing included) over a CSV, parsing only that column."""
+    counts: Optional[pd.Series] = None
+    for chunk in pd.read_csv(path, usecols=[target_col], chunksize=chunksize, engine="c"):
+        chunk_counts = chunk[target_col].value_counts(dropna=False)
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+    return counts if counts is not None else pd.Series(dtype=np.int64)
+
+
+def sample_csv(
+    path: Union[str, Path],
+    target_col: Optional[str],
+    max_rows: int = 5000,
+    task_type: Optional[str] = None,
+    chunksize: int = 100_000,
+    random_state: Union[int, np.random.Generator, None] = 42,
+) -> tuple[pd.DataFrame, int]:
+    """Stream a CSV in chunks and return at most ``max_rows`` sampled rows.
+
+    Every row gets a uniform random key and only the smallest keys survive
+    (vectorized reservoir sampling), so the whole file is never held in memory.
+    For classification tasks with a valid ``target_col``, a first pass over the
+    target column alone counts the classes, which fixes each class's final
+    quota up front; the reservoir then keeps at most that many rows per class,
+    bounding peak memory to ``max_rows + chunksize`` rows in both modes.
+
+    Returns the sample (in file order) and the total number of rows in the file.
+    """
+    if max_rows <= 0:
+        raise ValueError("max_rows must be positive for streaming sampling")
+    columns = pd.read_csv(path, nrows=0, engine="c").columns
+    if target_col is not None and target_col not in columns:
+        raise ValueError(f"Target column '{target_col}' not found in {path}")
+
+    quotas: Optional[pd.Series] = None
+    if task_type == "classification" and target_col is not None:
+        counts = _count_classes(path, target_col, chunksize)
+        if counts.sum() > max_rows:
+            quotas = pd.Series(_allocate_quotas(counts.to_numpy(), max_rows), index=counts.index)
+
+    rng = np.random.default_rng(random_state)
+    reservoir: Optional[pd.DataFrame] = None
+    keys = np.empty(0)
+    total_rows = 0
+    # The pyarrow engine has no chunked mode, so streaming uses the C parser
+    for chunk in pd.read_csv(path, chunksize=chunksize, engine="c"):
+        total_rows += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if reservoir is not None:
+            chunk = pd.concat([reservoir, chunk])
+            chunk_keys = np.concatenate([keys, chunk_keys])
+
+        if quotas is not None:
+            labels = chunk[target_col]
+            keep = np.flatnonzero(_rank_within_class(labels, chunk_keys) <= labels.map(quotas).to_numpy())
+            chunk, chunk_keys = chunk.iloc[keep], chunk_keys[keep]
+        elif len(chunk) > max_rows:
+            keep = np.argpartition(chunk_keys, max_rows - 1)[:max_rows]
+            chunk, chunk_keys = chunk.iloc[keep], chunk_keys[keep]
+        reservoir, keys = chunk, chunk_keys
+
+    if reservoir is None:
+        return pd.read_csv(path, engine="c"), 0
+    logger.info(
+        "%s streaming sample created: sampled_rows=%d, original_rows=%d",
+        "Stratified" if quotas is not None else "Random",
+        len(reservoir),
+        total_rows,
+    )
+    # Chunk indices continue across the file, so sort_index restores file order
+    return reservoir.sort_index().reset_index(drop=True), total_rows
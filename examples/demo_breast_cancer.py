@@ -8,6 +8,7 @@ Demonstration of the full AutoML workflow on a medical dataset:
 Run: python examples/demo_breast_cancer.py
 """
 
+import pandas as pd
 from sklearn.datasets import load_breast_cancer
 from automl.pipeline import run_pipeline
 
@@ -19,8 +20,7 @@ def main():
 
     # Load Breast Cancer dataset and prepare DataFrame
     cancer = load_breast_cancer(as_frame=True)
-    df = cancer.frame.copy()
-    df["target"] = cancer.target
+    df = cancer.frame.assign(target=cancer.target)
 
     initial_n_features = df.shape[1] - 1  # Exclude target
 
@@ -73,12 +73,13 @@ def main():
     # Evaluation metrics per model
     print("Baseline Model Metrics:")
     evaluation_results = results["evaluation_results"]
-    for model_name, res in evaluation_results.items():
-        metrics = res.get("metrics", {})
-        acc = metrics.get("accuracy")
-        f1 = metrics.get("f1_weighted")
-        if acc is not None and f1 is not None:
-            print(f"  {model_name}: Accuracy={acc:.4f}, F1-weighted={f1:.4f}")
+    # One model-by-metric table formatted and written in a single call
+    metrics_df = pd.DataFrame.from_dict(
+        {name: res.get("metrics", {}) for name, res in evaluation_results.items()},
+        orient="index",
+    )
+    metrics_df = metrics_df.filter(items=["accuracy", "f1_weighted"]).dropna()
+    print(metrics_df.round(4).to_string())
 
     print()
 
@@ -6,11 +6,12 @@ Demonstrates running the AutoML pipeline on a user-provided CSV dataset:
 3. Run the full pipeline
 4. Print concise summary with error handling
 
-Run: python examples/demo_custom_dataset.py --csv path/to/data.csv --target target_col [--task classification] [--no-feature-selection] [--no-tuning]
+Run: python examples/demo_custom_dataset.py --csv path/to/data.csv --target target_col [--task classification] [--no-feature-selection] [--no-tuning] [--max-rows N]
 
 Examples:
   python examples/demo_custom_dataset.py --csv data.csv --target target
   python examples/demo_custom_dataset.py --csv data.csv --target price --task regression --no-feature-selection
+  python examples/demo_custom_dataset.py --csv big.csv --target target --max-rows 50000
 """
 
 import argparse
@@ -19,7 +20,31 @@ from pathlib import Path
 
 import pandas as pd
 
+try:  # polars is optional; its multithreaded CSV reader is used when installed
+    import polars as pl
+except ImportError:  # pragma: no cover - environment dependent
+    pl = None
+
 from automl.pipeline import run_pipeline
+from automl.utils.cardinality import cardinality_at_least
+from automl.utils.sampling import sample_csv
+
+# pandas' default missing-value tokens, so polars parses NAs the same way
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+
+def read_csv(csv_path):
+    """Read a CSV with polars when available, falling back to pandas on parse errors."""
+    if pl is not None:
+        try:
+            return pl.read_csv(csv_path, null_values=PANDAS_NA_VALUES, infer_schema_length=10_000)
+        except pl.exceptions.PolarsError as e:
+            print(f"polars could not parse the CSV ({e}); falling back to pandas")
+    return pd.read_csv(csv_path)
 
 
 def validate_inputs(csv_path, target_col, df):
@@ -33,16 +58,32 @@ def validate_inputs(csv_path, target_col, df):
 
 
 def infer_task_type(df, target_col):
-    """Infer task type from target column dtype and cardinality."""
-    target = df[target_col]
-    n_unique = target.nunique()
-    n_samples = len(target)
+    """Infer task type from target column dtype and cardinality.
 
-    if pd.api.types.is_integer_dtype(target) or pd.api.types.is_bool_dtype(target):
-        return "classification"
-    if n_unique < max(20, int(0.1 * n_samples)):
-        return "classification"
-    return "regression"
+    Accepts a pandas or polars DataFrame.
+    """
+    target = df[target_col]
+    threshold = max(20, int(0.1 * len(target)))
+
+    if pl is not None and isinstance(target, pl.Series):
+        if target.dtype.is_integer() or target.dtype == pl.Boolean:
+            return "classification"
+        is_numeric = target.dtype.is_numeric()
+        if not is_numeric:
+            n_unique = target.drop_nulls().n_unique()  # match pandas nunique (nulls excluded)
+    else:
+        if pd.api.types.is_integer_dtype(target) or pd.api.types.is_bool_dtype(target):
+            return "classification"
+        is_numeric = pd.api.types.is_numeric_dtype(target)
+        if not is_numeric:
+            n_unique = target.nunique()
+
+    if is_numeric:
+        # Stops scanning as soon as the threshold is reached (numba-compiled when available)
+        high_cardinality = cardinality_at_least(target.to_numpy(), threshold)
+    else:
+        high_cardinality = n_unique >= threshold
+    return "regression" if high_cardinality else "classification"
 
 
 def parse_args(argv=None):
@@ -58,6 +99,8 @@ def parse_args(argv=None):
     parser.add_argument("--no-tuning", action="store_true", help="Disable hyperparameter tuning")
     parser.add_argument("--search-method", type=str, default="grid", choices=["grid", "random", "bayesian"], help="Tuning search method")
     parser.add_argument("--data-type", type=str, default=None, choices=["tabular", "text", "timeseries"], help="Override data type detection")
+    parser.add_argument("--max-rows", type=int, default=None, help="Reservoir-sample at most N rows while reading the CSV")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk when --max-rows is set")
     return parser.parse_args(argv)
 
 
@@ -71,7 +114,13 @@ def main(argv=None):
         print("="*70 + "\n")
 
         print(f"Loading CSV: {args.csv}")
-        df = pd.read_csv(args.csv)
+        if args.max_rows:
+            if not Path(args.csv).exists():
+                raise FileNotFoundError(f"CSV file not found: {args.csv}")
+            df, _ = sample_csv(args.csv, args.target, args.max_rows, args.task, args.chunksize)
+            print(f"Reservoir-sampled up to {args.max_rows} rows")
+        else:
+            df = read_csv(args.csv)
         print(f"Shape: {df.shape}")
 
         # Validate inputs
@@ -88,6 +137,10 @@ def main(argv=None):
         preprocessing_params = {"data_type_override": args.data_type} if args.data_type else {}
         hyperparameter_params = {"search_method": args.search_method}
 
+        # Convert to pandas only at the pipeline boundary
+        if pl is not None and isinstance(df, pl.DataFrame):
+            df = df.to_pandas()
+
         # Run pipeline
         print("Running pipeline (preprocessing → feature selection → training → evaluation → tuning)...\n")
         results = run_pipeline(
@@ -135,15 +188,14 @@ def main(argv=None):
         best_model_name = results.get("best_model_name")
         best_metrics = evaluation_results.get(best_model_name, {}).get("metrics", {})
 
-        print(f"Best Model: {best_model_name}")
         if task_type == "classification":
-            for k in ["accuracy", "f1_weighted", "precision_weighted", "recall_weighted"]:
-                if k in best_metrics:
-                    print(f"  {k}: {best_metrics[k]:.4f}")
+            metric_keys = ["accuracy", "f1_weighted", "precision_weighted", "recall_weighted"]
         else:
-            for k in ["rmse", "r2", "mae"]:
-                if k in best_metrics:
-                    print(f"  {k}: {best_metrics[k]:.4f}")
+            metric_keys = ["rmse", "r2", "mae"]
+        # Format the whole block first and write it with a single print
+        lines = [f"Best Model: {best_model_name}"]
+        lines += [f"  {k}: {best_metrics[k]:.4f}" for k in metric_keys if k in best_metrics]
+        print("\n".join(lines))
 
         print()
 
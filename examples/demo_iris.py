@@ -8,6 +8,7 @@ Quick demonstration of the full AutoML workflow:
 Run: python examples/demo_iris.py
 """
 
+import pandas as pd
 from sklearn.datasets import load_iris
 from automl.pipeline import run_pipeline
 
@@ -19,8 +20,7 @@ def main():
 
     # Load Iris dataset and prepare DataFrame
     iris = load_iris(as_frame=True)
-    df = iris.frame.copy()
-    df["target"] = iris.target
+    df = iris.frame.assign(target=iris.target)
 
     print(f"Dataset: Iris")
     print(f"Shape: {df.shape}")
@@ -66,14 +66,12 @@ def main():
     # Evaluation metrics per model
     print("Baseline Model Metrics:")
     evaluation_results = results["evaluation_results"]
-    for model_name, res in evaluation_results.items():
-        metrics = res.get("metrics", {})
-        print(f"  {model_name}:")
-        for metric_name, metric_value in metrics.items():
-            if isinstance(metric_value, float):
-                print(f"    {metric_name}: {metric_value:.4f}")
-            else:
-                print(f"    {metric_name}: {metric_value}")
+    # One model-by-metric table formatted and written in a single call
+    metrics_df = pd.DataFrame.from_dict(
+        {name: res.get("metrics", {}) for name, res in evaluation_results.items()},
+        orient="index",
+    )
+    print(metrics_df.round(4).to_string())
 
     print()
 
@@ -2,19 +2,26 @@
 
 Usage:
   python examples/run_saved_model.py --run-id 20251222_010221_87771d68 --data-path path/to/new_data.csv [--output-path preds.csv]
+  python examples/run_saved_model.py --run-id 20251222_010221_87771d68 --batch path/to/csv_dir [--output-path preds_dir]
 
 Notes:
 - Expects input data with the SAME feature schema used during training (after preprocessing).
 - If your preprocessing includes scalers/encoders, this script will apply them when available.
 - For text/vectorizer workflows, ensure your input includes the same text column used in training.
+- In --batch mode every *.csv in the directory is scored with one loaded model; predictions go to
+  <output-path>/<name>_predictions.csv (default: <batch dir>/predictions/).
 """
 
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import sys
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 # Ensure project root is on sys.path for direct script execution
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -23,45 +30,80 @@ if str(ROOT_DIR) not in sys.path:
 
 from automl.utils.artifact_manager import load_artifacts
 
+# Inputs at least this long are predicted in row chunks on parallel workers
+PREDICT_CHUNK_ROWS = 50_000
+
+
+@lru_cache(maxsize=8)
+def _get_artifacts(run_id: str) -> dict:
+    """Load a run's artifacts once per process; repeat calls reuse the unpickled model."""
+    return load_artifacts(run_id)
+
+
+def _predict(model, X, n_jobs: int = -1) -> np.ndarray:
+    """Predict in row chunks of ``PREDICT_CHUNK_ROWS`` across worker threads.
+
+    Threads share the loaded model instead of pickling it to every process,
+    and tree/linear ``predict`` runs in NumPy/Cython code that releases the
+    GIL. Chunking also bounds the per-call intermediate memory of ensembles.
+    """
+    n_rows = X.shape[0]
+    if n_rows < PREDICT_CHUNK_ROWS:
+        return model.predict(X)
+    rows = X.iloc if isinstance(X, pd.DataFrame) else X
+    chunks = [rows[start:start + PREDICT_CHUNK_ROWS] for start in range(0, n_rows, PREDICT_CHUNK_ROWS)]
+    preds = Parallel(n_jobs=n_jobs, prefer="threads")(delayed(model.predict)(chunk) for chunk in chunks)
+    return np.concatenate(preds)
+
 
 def load_and_predict(run_id: str, data_path: Path, output_path: Path | None = None) -> pd.DataFrame:
     if not data_path.exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
 
     # Load artifacts (model + preprocessors + metadata)
-    artifacts = load_artifacts(run_id)
+    artifacts = _get_artifacts(run_id)
     model = artifacts["model"]
     preprocessors = artifacts.get("preprocessors", {}) or {}
 
     # Load new data
     df = pd.read_csv(data_path)
 
-    # Apply preprocessors when available
-    # Scaler: apply to numeric columns
-    scaler = preprocessors.get("scaler")
-    if scaler is not None:
-        numeric_cols = df.select_dtypes(include=["number"]).columns
-        if len(numeric_cols) > 0:
-            df[numeric_cols] = scaler.transform(df[numeric_cols])
-
-    # Encoders: assume already fitted encoders keyed by column name
-    encoders = preprocessors.get("encoders")
-    if encoders:
-        for col, encoder in encoders.items():
-            if col in df.columns:
-                df[col] = encoder.transform(df[[col]])
-
-    # Vectorizer (text): assumes single text column named "text"
-    vectorizer = preprocessors.get("vectorizer")
-    if vectorizer is not None:
-        text_col = "text"
-        if text_col not in df.columns:
-            raise ValueError(f"Expected text column '{text_col}' for vectorization")
-        df_vec = vectorizer.transform(df[text_col])
-        preds = model.predict(df_vec)
+    # Preferred: one fitted transformer (imputation + encoding + scaling) saved at training time
+    column_transformer = preprocessors.get("column_transformer")
+    if column_transformer is not None:
+        X = column_transformer.transform(df)
+        selected_indices = preprocessors.get("selected_indices")
+        if selected_indices:
+            X = X[:, selected_indices]
+        preds = _predict(model, X)
     else:
-        # For tabular/time-series preprocessed frames
-        preds = model.predict(df)
+        # Legacy artifacts: apply preprocessors column by column
+        # Scaler: apply to numeric columns
+        scaler = preprocessors.get("scaler")
+        if scaler is not None:
+            # Column list saved at training time; dtype scan only for old artifacts
+            numeric_cols = preprocessors.get("numeric_cols") or df.select_dtypes(include=["number"]).columns.tolist()
+            if len(numeric_cols) > 0:
+                df.loc[:, numeric_cols] = scaler.transform(df[numeric_cols].to_numpy(copy=False))
+
+        # Encoders: assume already fitted encoders keyed by column name
+        encoders = preprocessors.get("encoders")
+        if encoders:
+            for col, encoder in encoders.items():
+                if col in df.columns:
+                    df[col] = encoder.transform(df[[col]])
+
+        # Vectorizer (text): single text column, name saved at training time
+        vectorizer = preprocessors.get("vectorizer")
+        if vectorizer is not None:
+            text_col = preprocessors.get("text_col", "text")
+            if text_col not in df.columns:
+                raise ValueError(f"Expected text column '{text_col}' for vectorization")
+            df_vec = vectorizer.transform(df[text_col])
+            preds = _predict(model, df_vec)
+        else:
+            # For tabular/time-series preprocessed frames
+            preds = _predict(model, df)
 
     pred_series = pd.Series(preds, name="prediction")
 
@@ -73,16 +115,53 @@ def load_and_predict(run_id: str, data_path: Path, output_path: Path | None = No
     return pred_series
 
 
+def predict_batch(
+    run_id: str, data_dir: Path, output_dir: Path | None = None, max_workers: int | None = None
+) -> dict[Path, pd.Series]:
+    """Score every CSV in ``data_dir`` with one loaded model.
+
+    Files are read, predicted and written on a thread pool; CSV parsing and
+    NumPy-backed ``predict`` calls release the GIL, so files overlap.
+    """
+    if not data_dir.is_dir():
+        raise FileNotFoundError(f"Batch directory not found: {data_dir}")
+    csv_paths = sorted(data_dir.glob("*.csv"))
+    if not csv_paths:
+        raise FileNotFoundError(f"No CSV files found in {data_dir}")
+    output_dir = output_dir or data_dir / "predictions"
+
+    # Load once up front so worker threads all hit the warm cache
+    _get_artifacts(run_id)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _predict_file(path: Path) -> pd.Series:
+        preds = load_and_predict(run_id, path)
+        preds.to_csv(output_dir / f"{path.stem}_predictions.csv", index=False)
+        return preds
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(csv_paths, executor.map(_predict_file, csv_paths)))
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Run predictions using a saved AutoML model")
     parser.add_argument("--run-id", required=True, help="run_id of the saved artifacts (folder name under artifacts/)")
-    parser.add_argument("--data-path", required=True, type=Path, help="Path to CSV with new data")
-    parser.add_argument("--output-path", type=Path, help="Optional path to save predictions CSV")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data-path", type=Path, help="Path to CSV with new data")
+    source.add_argument("--batch", type=Path, help="Directory of CSVs to score with one model load")
+    parser.add_argument("--output-path", type=Path, help="Optional path to save predictions CSV (directory in --batch mode)")
     args = parser.parse_args(argv)
 
     try:
-        preds = load_and_predict(args.run_id, args.data_path, args.output_path)
-        print(preds)
+        if args.batch is not None:
+            output_dir = args.output_path or args.batch / "predictions"
+            for path, preds in predict_batch(args.run_id, args.batch, output_dir).items():
+                print(f"{path.name}: {len(preds)} predictions")
+            print(f"Predictions written to {output_dir}")
+        else:
+            preds = load_and_predict(args.run_id, args.data_path, args.output_path)
+            print(preds)
     except Exception as exc:  # noqa: BLE001
         print(f"Error during prediction: {exc}", file=sys.stderr)
         return 1
@@ -3,33 +3,66 @@
 This script will:
 1. Find all .pkl model files in the results_api directory
 2. Attempt to load them
-3. Re-save them with protocol=4 for better compatibility
+3. Re-save them with protocol=4 for better compatibility (uncompressed by
+   default; --compress uses lz4 when available, zlib otherwise)
+
+Files are independent, so they are processed in parallel worker processes.
+
+Run: python fix_pickle_models.py [--workers N] [--compress]
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Tuple
+
 import joblib
 from pathlib import Path
 import sys
 
-def fix_pickle_file(pkl_path: Path) -> bool:
-    """Try to load and re-save a pickle file with protocol=4."""
+from automl.utils.artifact_manager import DEFAULT_COMPRESS
+
+def fix_pickle_file(pkl_path: Path, compress: Any = 0) -> Tuple[bool, str]:
+    """Try to load and re-save a pickle file with protocol=4.
+
+    The new pickle is written to a temporary sibling and renamed over the
+    original only after the dump succeeds, so a failed rewrite never leaves a
+    truncated model behind.
+
+    Returns a ``(success, message)`` pair so the parent process can report
+    results in completion order without interleaved worker output.
+    """
+    tmp_path = pkl_path.with_suffix(pkl_path.suffix + ".tmp")
     try:
-        print(f"Processing: {pkl_path}")
+        original_size = pkl_path.stat().st_size
         
         # Try to load the model
         model = joblib.load(pkl_path)
         
-        # Re-save with protocol=4
-        joblib.dump(model, pkl_path, protocol=4)
+        # Re-save with protocol=4; the writer's final offset is the new file
+        # size, so no stat() is needed after the rename
+        with open(tmp_path, "wb", buffering=1 << 16) as fh:
+            joblib.dump(model, fh, protocol=4, compress=compress)
+            new_size = fh.tell()
+        os.replace(tmp_path, pkl_path)
         
-        print(f"  ✓ Successfully fixed: {pkl_path}")
-        return True
+        return True, (f"  ✓ Successfully fixed: {pkl_path} "
+                      f"({original_size / 1024:.1f} KB -> {new_size / 1024:.1f} KB)")
         
     except Exception as e:
-        print(f"  ✗ Failed to fix {pkl_path}: {e}")
-        return False
+        tmp_path.unlink(missing_ok=True)
+        return False, f"  ✗ Failed to fix {pkl_path}: {e}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-save pickled models with protocol=4")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--compress", action="store_true", help="Compress the rewritten pickles (lz4 when available, zlib otherwise)")
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
     results_dir = Path("results_api")
     
     if not results_dir.exists():
@@ -48,11 +81,18 @@ def main():
     success_count = 0
     fail_count = 0
     
-    for pkl_file in pkl_files:
-        if fix_pickle_file(pkl_file):
-            success_count += 1
-        else:
-            fail_count += 1
+    # Processes, not threads: unpickling estimators is largely CPU-bound Python
+    workers = max(1, min(args.workers or 1, len(pkl_files)))
+    compress = DEFAULT_COMPRESS if args.compress else 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fix_pickle_file, pkl_file, compress): pkl_file for pkl_file in pkl_files}
+        for future in as_completed(futures):
+            ok, message = future.result()
+            print(message)
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
     
     print(f"\n{'='*60}")
     print(f"Summary:")
@@ -6,32 +6,112 @@ Provides a CLI to run the AutoML pipeline on CSV or built-in datasets.
 from __future__ import annotations
 
 import argparse
-import json
+import io
 import sys
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
-from automl.utils.sampling import sample_dataset
-from automl.pipeline import run_pipeline
+from automl.utils.sampling import sample_csv, sample_dataset
 
+# Heavy modules (sklearn via automl.pipeline, joblib, numba) are imported inside
+# the functions that use them so --help and argument errors return quickly
 
-def load_builtin_dataset(name: str) -> tuple[pd.DataFrame, str]:
-    """Load a built-in sklearn dataset and return DataFrame + target column name."""
+# Report banners, built once
+BAR = "=" * 70
+DASH = "-" * 70
+
+
+_BUILTIN_ALIASES = {
+    "iris": "iris",
+    "breast": "breast_cancer",
+    "breast_cancer": "breast_cancer",
+    "breast-cancer": "breast_cancer",
+}
+
+
+def _fetch_builtin(name: str) -> tuple[pd.DataFrame, pd.Series]:
+    """Run the sklearn loader; results are pickled to the joblib cache."""
     from sklearn.datasets import load_iris, load_breast_cancer
 
-    name_lc = name.strip().lower()
-    if name_lc in {"iris"}:
-        data = load_iris(as_frame=True)
-    elif name_lc in {"breast", "breast_cancer", "breast-cancer"}:
-        data = load_breast_cancer(as_frame=True)
-    else:
+    data = load_iris(as_frame=True) if name == "iris" else load_breast_cancer(as_frame=True)
+    return data.frame, data.target
+
+
+@lru_cache(maxsize=None)
+def _load_builtin(name: str) -> tuple[pd.DataFrame, pd.Series]:
+    """In-process memo over the disk cache; callers must not mutate the result."""
+    import joblib
+
+    # On-disk cache for built-in datasets, shared across CLI runs
+    memory = joblib.Memory(Path.home() / ".cache" / "automl", verbose=0)
+    return memory.cache(_fetch_builtin)(name)
+
+
+def load_builtin_dataset(name: str) -> tuple[pd.DataFrame, str]:
+    """Load a built-in sklearn dataset and return DataFrame + target column name."""
+    name_lc = _BUILTIN_ALIASES.get(name.strip().lower())
+    if name_lc is None:
         raise ValueError("Unsupported built-in dataset. Choose 'iris' or 'breast_cancer'.")
 
-    df = data.frame.copy()
-    df["target"] = data.target
-    return df, "target"
+    frame, target = _load_builtin(name_lc)
+    # assign returns a new frame, so the cached one is never modified
+    return frame.assign(target=target), "target"
+
+
+def _infer_task_type(series: pd.Series) -> str:
+    """Guess the task type from the target's dtype and cardinality.
+
+    Integer, boolean, categorical and string targets are classification. Float
+    targets are classification only when they hold at most sqrt(n) distinct
+    non-NaN values (e.g. class labels parsed as floats because of gaps).
+    """
+    if series.dtype.kind != "f":
+        return "classification"
+    from automl.utils.cardinality import cardinality_at_least
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    # Early-exit distinct count; stops once the threshold is crossed
+    threshold = int(np.sqrt(len(values))) + 1
+    return "regression" if cardinality_at_least(values, threshold) else "classification"
+
+
+def _read_csv(path: Path, engine: str = "pyarrow") -> pd.DataFrame:
+    """Read a whole CSV, using pandas' multithreaded pyarrow parser when asked.
+
+    Falls back to the C engine when pyarrow is not installed or rejects the
+    file, so the flag is always safe to leave at its default.
+    """
+    if engine == "pyarrow":
+        try:
+            return pd.read_csv(path, engine="pyarrow")
+        except (ImportError, TypeError, ValueError):
+            pass
+    # low_memory=False infers each column's dtype once over the whole file
+    return pd.read_csv(path, engine="c", low_memory=False)
+
+
+def _py(value: Any) -> Any:
+    """Convert a NumPy scalar to the equivalent Python scalar; pass others through."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_eval_csv(evaluation_results: Dict[str, Any], path: str) -> None:
+    """Write per-model metrics as CSV (one row per model, one column per metric)."""
+    # Union of metric names in first-seen order (the old transpose's column order)
+    metric_keys = list(dict.fromkeys(
+        k for res in evaluation_results.values() for k in res.get("metrics", {})
+    ))
+    # Row lists build one float64 block instead of boxing a dict-of-dicts transpose
+    rows = [
+        [res.get("metrics", {}).get(k, np.nan) for k in metric_keys]
+        for res in evaluation_results.values()
+    ]
+    eval_df = pd.DataFrame(rows, index=list(evaluation_results), columns=metric_keys)
+    eval_df.to_csv(path, index=True)
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -41,9 +121,11 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--target", type=str, default=None, help="Target column name (ignored for built-in)")
     parser.add_argument("--task", type=str, required=False, default=None, choices=["classification", "regression"], help="Task type")
     parser.add_argument("--data-type", type=str, required=False, default=None, choices=["tabular", "text", "image", "timeseries"], help="Override data type detection")
+    parser.add_argument("--csv-engine", type=str, default="pyarrow", choices=["pyarrow", "c"], help="CSV parser for unsampled reads only (--max-sample-rows 0); sampled reads always stream with c. pyarrow falls back to c when unavailable")
     parser.add_argument("--max-sample-rows", type=int, default=5000, help="Maximum rows to sample; set to 0 to disable")
     parser.add_argument("--no-feature-selection", action="store_true", help="Disable feature selection")
     parser.add_argument("--no-tuning", action="store_true", help="Disable hyperparameter tuning")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel workers for hyperparameter search (-1 uses all cores)")
     parser.add_argument("--search-method", type=str, default="grid", choices=["grid", "random", "bayesian"], help="Tuning search method")
     parser.add_argument("--save", type=str, default="results_summary.json", help="Output file for metrics and summary (JSON)")
     parser.add_argument("--save-eval-csv", type=str, default=None, help="Optional path to save per-model evaluation metrics as CSV")
@@ -53,9 +135,9 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
 def main(argv: Optional[list[str]] = None) -> int:
     args = parse_args(argv)
 
-    print("\n" + "="*70)
+    print("\n" + BAR)
     print("AutoML System - Entry Point")
-    print("="*70)
+    print(BAR)
 
     dataset_df: pd.DataFrame
     target_col: Optional[str]
@@ -71,17 +153,25 @@ def main(argv: Optional[list[str]] = None) -> int:
             path = Path(args.dataset)
             if not path.exists():
                 raise FileNotFoundError(f"Dataset not found: {path}")
-            print(f"\nLoading CSV dataset from: {path}")
-            dataset_df = pd.read_csv(path)
-            if target_col is None and not args.target:
+            if not args.target:
                 raise ValueError("--target is required when using --dataset")
             target_col = args.target
-            if task_type is None:
-                # Simple inference: classification if target is integer-like
-                if pd.api.types.is_integer_dtype(dataset_df[target_col]):
-                    task_type = "classification"
-                else:
-                    task_type = "regression"
+            print(f"\nLoading CSV dataset from: {path}")
+            if args.max_sample_rows > 0:
+                if task_type is None:
+                    # Infer from the head of the target column before streaming
+                    head = pd.read_csv(path, usecols=[target_col], nrows=100_000, engine="c")
+                    task_type = _infer_task_type(head[target_col])
+                # Sample while streaming so the full file is never held in memory
+                dataset_df, total_rows = sample_csv(
+                    path, target_col, args.max_sample_rows, task_type
+                )
+                if len(dataset_df) != total_rows:
+                    print(f"Sampled {len(dataset_df)} rows while reading (from {total_rows})")
+            else:
+                dataset_df = _read_csv(path, args.csv_engine)
+                if task_type is None:
+                    task_type = _infer_task_type(dataset_df[target_col])
         else:
             # Interactive prompt if no dataset provided
             print("\nNo dataset provided.")
@@ -94,18 +184,26 @@ def main(argv: Optional[list[str]] = None) -> int:
                 print("No dataset selected. Exiting.")
                 return 0
 
-        if args.max_sample_rows > 0:
+        if task_type == "classification" and dataset_df[target_col].dtype.kind == "f":
+            # Integral float labels (e.g. parsed as float in a CSV) become the
+            # smallest integer dtype so stratification hashes ints, not floats
+            labels = dataset_df[target_col].to_numpy(dtype=np.float64, na_value=np.nan)
+            if not np.isnan(labels).any() and np.all(np.mod(labels, 1) == 0):
+                dataset_df[target_col] = pd.to_numeric(labels, downcast="integer")
+
+        if args.max_sample_rows <= 0:
+            print("Sampling disabled (max_sample_rows <= 0)")
+        elif len(dataset_df) > args.max_sample_rows:
             sampled_df = sample_dataset(
                 df=dataset_df,
                 target_col=target_col,
                 max_rows=args.max_sample_rows,
                 task_type=task_type,
             )
-            if len(sampled_df) != len(dataset_df):
-                print(f"Sampling dataset to {len(sampled_df)} rows (from {len(dataset_df)})")
+            print(f"Sampling dataset to {len(sampled_df)} rows (from {len(dataset_df)})")
             dataset_df = sampled_df
         else:
-            print("Sampling disabled (max_sample_rows <= 0)")
+            print(f"No sampling needed ({len(dataset_df)} <= {args.max_sample_rows} rows)")
 
         print(f"Target column: {target_col}")
         print(f"Task type: {task_type}")
@@ -114,7 +212,9 @@ def main(argv: Optional[list[str]] = None) -> int:
         feature_selection_enabled = not args.no_feature_selection
         tuning_enabled = not args.no_tuning
 
-        hyperparameter_params: Dict[str, Any] = {"search_method": args.search_method}
+        hyperparameter_params: Dict[str, Any] = {"search_method": args.search_method, "n_jobs": args.n_jobs}
+
+        from automl.pipeline import run_pipeline
 
         results = run_pipeline(
             dataset=dataset_df,
@@ -127,88 +227,98 @@ def main(argv: Optional[list[str]] = None) -> int:
             hyperparameter_params=hyperparameter_params,
         )
 
-        print("\n" + "="*70)
-        print("RESULTS")
-        print("="*70 + "\n")
-
-        print("Trained Models:")
-        for name in results["trained_models"].keys():
-            print(f"  - {name}")
-
-        print("\n" + "-"*70)
-        print("Evaluation Metrics (Baseline Models):")
-        print("-"*70 + "\n")
-        best_name = results["best_model"]["name"]
-        for name, res in results["evaluation_results"].items():
-            metrics = res.get("metrics", {})
+        # Collect the report and write it to stdout in one call
+        out = io.StringIO()
+        emit = partial(print, file=out)
+
+        emit("\n" + BAR)
+        emit("RESULTS")
+        emit(BAR + "\n")
+
+        emit("Trained Models:")
+        for name in results["trained_models"]:
+            emit(f"  - {name}")
+
+        emit("\n" + DASH)
+        emit("Evaluation Metrics (Baseline Models):")
+        emit(DASH + "\n")
+        best_name = results["best_model_name"]
+        # Format each float metric once; both blocks below reuse the strings
+        fmt = {
+            name: {k: f"{v:.4f}" for k, v in res.get("metrics", {}).items() if isinstance(v, float)}
+            for name, res in results["evaluation_results"].items()
+        }
+        for name, metric_strs in fmt.items():
             marker = " ✓ BEST" if name == best_name else ""
-            print(f"{name}{marker}:")
-            for k, v in metrics.items():
-                if isinstance(v, float):
-                    print(f"  {k}: {v:.4f}")
-
-        print("\n" + "-"*70)
-        print("Best Model Summary:")
-        print("-"*70 + "\n")
-        print(f"Name: {best_name}")
-        best_metrics = results["evaluation_results"][best_name].get("metrics", {})
-        for k, v in best_metrics.items():
-            if isinstance(v, float):
-                print(f"  {k}: {v:.4f}")
-
-        print("\n" + "-"*70)
-        print("Tuned Model (if hyperparameter tuning enabled):")
-        print("-"*70 + "\n")
+            emit(f"{name}{marker}:")
+            if metric_strs:
+                emit("\n".join(f"  {k}: {v}" for k, v in metric_strs.items()))
+
+        emit("\n" + DASH)
+        emit("Best Model Summary:")
+        emit(DASH + "\n")
+        emit(f"Name: {best_name}")
+        if fmt.get(best_name):
+            emit("\n".join(f"  {k}: {v}" for k, v in fmt[best_name].items()))
+
+        emit("\n" + DASH)
+        emit("Tuned Model (if hyperparameter tuning enabled):")
+        emit(DASH + "\n")
         tuned = results.get("tuned_model")
         if tuned is not None:
-            print(f"Best parameters: {tuned.get('best_params')}")
-            print(f"Best CV score: {tuned.get('best_score'):.4f}")
+            emit(f"Best parameters: {tuned.get('best_params')}")
+            emit(f"Best CV score: {tuned.get('best_score'):.4f}")
         else:
-            print("Hyperparameter tuning: Not applied")
+            emit("Hyperparameter tuning: Not applied")
 
-        print("\n" + "-"*70)
-        print("Selected Features (if feature selection enabled):")
-        print("-"*70 + "\n")
+        emit("\n" + DASH)
+        emit("Selected Features (if feature selection enabled):")
+        emit(DASH + "\n")
         selected_features = results.get("selected_features")
         if selected_features is not None:
             n_selected = len(selected_features) if isinstance(selected_features, list) else 1
-            print(f"Count: {n_selected}")
+            emit(f"Count: {n_selected}")
             if isinstance(selected_features, list) and selected_features:
-                print(f"Features: {', '.join(selected_features[:10])}" + 
-                      (f"\n... ({n_selected} total)" if n_selected > 10 else ""))
+                emit(f"Features: {', '.join(selected_features[:10])}" + 
+                     (f"\n... ({n_selected} total)" if n_selected > 10 else ""))
         else:
-            print("Feature selection: Not applied")
+            emit("Feature selection: Not applied")
+
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
         # Save summary
-        print("\n" + "="*70)
+        print("\n" + BAR)
         print("Saving Results")
-        print("="*70 + "\n")
+        print(BAR + "\n")
         save_path = Path(args.save)
         print(f"Summary JSON: {save_path}")
         summary = {
             "task_type": task_type,
             "target_column": target_col,
             "best_model_name": best_name,
-            "best_model_metrics": results["evaluation_results"].get(best_name, {}).get("metrics", {}),
+            # Plain Python scalars keep either JSON encoder on its fast path
+            "best_model_metrics": {
+                k: _py(v)
+                for k, v in results["evaluation_results"].get(best_name, {}).get("metrics", {}).items()
+            },
             "tuned": tuned is not None,
             "tuned_best_params": tuned.get("best_params") if tuned is not None else None,
-            "tuned_best_score": tuned.get("best_score") if tuned is not None else None,
+            "tuned_best_score": _py(tuned.get("best_score")) if tuned is not None else None,
         }
-        with save_path.open("w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2)
+        from automl.utils.artifact_manager import write_json
+
+        # orjson when installed; serializes NumPy metric values natively
+        write_json(summary, save_path)
 
         # Optional: save evaluation metrics to CSV
         if args.save_eval_csv:
             print(f"Evaluation CSV: {args.save_eval_csv}")
-            eval_df = pd.DataFrame({
-                model: metrics.get("metrics", {})
-                for model, metrics in results["evaluation_results"].items()
-            }).T
-            eval_df.to_csv(args.save_eval_csv, index=True)
+            write_eval_csv(results["evaluation_results"], args.save_eval_csv)
 
-        print("\n" + "="*70)
+        print("\n" + BAR)
         print("AutoML Pipeline Complete ✓")
-        print("="*70 + "\n")
+        print(BAR + "\n")
         return 0
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
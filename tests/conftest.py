@@ -0,0 +1,8 @@
+"""Shared pytest setup: make the project root importable when running from any directory."""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
@@ -0,0 +1,35 @@
+"""Tests for the CLI helpers in main.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from main import _infer_task_type
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        pd.Series(["cat", "dog", "cat", "bird"] * 25),
+        pd.Series(["cat", "dog", "cat", "bird"] * 25, dtype=object),
+        pd.Series([True, False] * 50),
+        pd.Series(pd.Categorical(["a", "b"] * 50)),
+        pd.Series(np.arange(100) % 3),
+        # Integral labels parsed as float because of gaps
+        pd.Series([0.0, 1.0, np.nan, 2.0] * 25),
+    ],
+    ids=["string", "object", "bool", "category", "int", "integral-float"],
+)
+def test_infer_task_type_classification(series):
+    assert _infer_task_type(series) == "classification"
+
+
+def test_infer_task_type_continuous_float_is_regression():
+    series = pd.Series(np.random.default_rng(0).normal(size=100))
+    assert _infer_task_type(series) == "regression"
+
+
+def test_infer_task_type_float_cardinality_threshold():
+    # sqrt(100) = 10: ten distinct floats are labels, eleven are continuous
+    assert _infer_task_type(pd.Series(np.arange(100) % 10 + 0.5)) == "classification"
+    assert _infer_task_type(pd.Series(np.arange(100) % 11 + 0.5)) == "regression"
@@ -0,0 +1,141 @@
+"""Tests for automl.utils.sampling."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import automl.utils.sampling as sampling
+from automl.utils.sampling import (
+    _allocate_quotas,
+    _stratified_sample_indices,
+    sample_csv,
+    sample_dataset,
+)
+
+
+def _make_frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "x": rng.normal(size=n),
+        "label": rng.choice(["a", "b", "c"], n, p=[0.7, 0.25, 0.05]),
+    })
+
+
+@pytest.mark.parametrize("counts, n", [
+    ([10, 10, 10], 7),
+    ([1000, 5], 999),
+    ([3, 1, 1, 1], 4),
+    ([7919, 104, 13, 1], 500),
+])
+def test_allocate_quotas_sum_to_n(counts, n):
+    counts = np.array(counts)
+    quotas = _allocate_quotas(counts, n)
+    assert quotas.sum() == n
+    # Largest remainder never strays more than one draw from the exact share
+    assert np.all(np.abs(quotas - counts * n / counts.sum()) < 1)
+
+
+def test_stratified_keeps_whole_classes():
+    y = pd.Series(["major"] * 1000 + ["rare"] * 5)
+    # Quotas are 994 + 1 and 5: the rare class's quota covers all its rows
+    idx = _stratified_sample_indices(y, 999, np.random.default_rng(0))
+
+    assert len(idx) == len(np.unique(idx)) == 999
+    assert set(range(1000, 1005)) <= set(idx.tolist())
+    assert (y.iloc[idx] == "major").sum() == 994
+
+
+def test_stratified_matches_quotas():
+    y = _make_frame()["label"]
+    idx = _stratified_sample_indices(y, 300, np.random.default_rng(0))
+    counts = y.value_counts(sort=False)
+
+    expected = pd.Series(_allocate_quotas(counts.to_numpy(), 300), index=counts.index)
+    pd.testing.assert_series_equal(y.iloc[idx].value_counts(sort=False), expected, check_names=False)
+
+
+@pytest.mark.parametrize("task_type", ["classification", None])
+def test_sample_dataset_is_seeded(task_type):
+    df = _make_frame()
+    first = sample_dataset(df, "label", max_rows=300, task_type=task_type, random_state=7)
+    second = sample_dataset(df, "label", max_rows=300, task_type=task_type, random_state=7)
+    other = sample_dataset(df, "label", max_rows=300, task_type=task_type, random_state=8)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first["id"].equals(other["id"])
+
+
+# Sampled fractions below and above TAKE_RATIO_THRESHOLD, then past NEAR_FULL_RATIO
+@pytest.mark.parametrize("max_rows", [100, 1000, 1950])
+@pytest.mark.parametrize("task_type", ["classification", None])
+def test_sample_dataset_take_and_mask_agree(monkeypatch, max_rows, task_type):
+    df = _make_frame()
+    results = []
+    # Forcing the threshold to either end sends the same draw down each gather
+    for threshold in (0.0, 1.0):
+        monkeypatch.setattr(sampling, "TAKE_RATIO_THRESHOLD", threshold)
+        results.append(sample_dataset(df, "label", max_rows=max_rows, task_type=task_type))
+    take, mask = results
+
+    pd.testing.assert_frame_equal(take, mask)
+    assert len(take) == max_rows
+    assert take["id"].is_monotonic_increasing and take["id"].is_unique
+    assert isinstance(take.index, pd.RangeIndex)
+
+
+def test_sample_dataset_returns_small_frame_unchanged():
+    df = _make_frame(n=50)
+    assert sample_dataset(df, "label", max_rows=50) is df
+
+
+def test_sample_csv_stratified(tmp_path):
+    df = _make_frame()
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+
+    sample, total = sample_csv(path, "label", max_rows=300, task_type="classification", chunksize=128)
+    counts = df["label"].value_counts(sort=False)
+    expected = pd.Series(_allocate_quotas(counts.to_numpy(), 300), index=counts.index)
+
+    assert total == len(df)
+    pd.testing.assert_series_equal(
+        sample["label"].value_counts().reindex(expected.index), expected, check_names=False
+    )
+    assert sample["id"].is_monotonic_increasing and sample["id"].is_unique
+    pd.testing.assert_frame_equal(sample, df.iloc[sample["id"]].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("task_type", ["classification", None])
+def test_sample_csv_is_seeded(tmp_path, task_type):
+    path = tmp_path / "data.csv"
+    _make_frame().to_csv(path, index=False)
+
+    first, _ = sample_csv(path, "label", max_rows=200, task_type=task_type, chunksize=128, random_state=3)
+    second, _ = sample_csv(path, "label", max_rows=200, task_type=task_type, chunksize=128, random_state=3)
+    other, _ = sample_csv(path, "label", max_rows=200, task_type=task_type, chunksize=128, random_state=4)
+
+    assert len(first) == 200
+    pd.testing.assert_frame_equal(first, second)
+    assert not first["id"].equals(other["id"])
+
+
+def test_sample_csv_header_only(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("id,x,label\n")
+
+    sample, total = sample_csv(path, "label", max_rows=10, task_type="classification")
+
+    assert total == 0
+    assert sample.empty
+    assert list(sample.columns) == ["id", "x", "label"]
+
+
+def test_sample_csv_rejects_bad_arguments(tmp_path):
+    path = tmp_path / "data.csv"
+    _make_frame(n=20).to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match="not found"):
+        sample_csv(path, "missing", max_rows=10)
+    with pytest.raises(ValueError, match="positive"):
+        sample_csv(path, "label", max_rows=0)
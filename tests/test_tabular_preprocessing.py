@@ -0,0 +1,132 @@
+"""Tests for automl.tabular_preprocessing."""
+
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+
+import automl.tabular_preprocessing as tabular_preprocessing
+from automl.tabular_preprocessing import preprocess_tabular, preprocess_tabular_streaming
+
+
+def _make_frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "num": rng.normal(size=n),
+        "small": pd.Series(rng.choice(["a", "b", "c"], n), dtype=object),
+        "wide": pd.Series(rng.choice([f"k{i}" for i in range(15)], n), dtype=object),
+        "flag": rng.choice([True, False], n),
+        "target": rng.integers(0, 2, n),
+    })
+    df.loc[::7, "num"] = np.nan
+    df.loc[::11, "small"] = None
+    df.loc[::13, "wide"] = np.nan
+    return df
+
+
+def test_column_transformer_reproduces_training_matrix():
+    df = _make_frame()
+    result, y = preprocess_tabular(df, target_col="target")
+
+    X_all = result["column_transformer"].transform(df.drop(columns=["target"]))
+    X_temp, _, y_temp, _ = train_test_split(X_all, y, test_size=0.2, random_state=42, stratify=y)
+    X_train, _ = train_test_split(X_temp, test_size=0.1 / 0.8, random_state=42, stratify=y_temp)
+
+    np.testing.assert_allclose(X_train, result["X_train"], atol=1e-5)
+
+
+def test_column_transformer_loads_without_automl(tmp_path):
+    df = _make_frame()
+    result, _ = preprocess_tabular(df, target_col="target")
+    features = df.drop(columns=["target"])
+    joblib.dump(result["column_transformer"], tmp_path / "preprocessing.pkl")
+    features.to_pickle(tmp_path / "features.pkl")
+    np.save(tmp_path / "expected.npy", result["column_transformer"].transform(features))
+
+    # Block the package so unpickling fails if any step references it
+    code = (
+        "import sys; sys.modules['automl'] = None\n"
+        "import joblib, numpy as np, pandas as pd\n"
+        "ct = joblib.load('preprocessing.pkl')\n"
+        "out = ct.transform(pd.read_pickle('features.pkl'))\n"
+        "np.testing.assert_allclose(out, np.load('expected.npy'))\n"
+    )
+    subprocess.run([sys.executable, "-I", "-c", code], cwd=tmp_path, check=True)
+
+
+def _write_streaming_csv(path, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "num": rng.normal(size=n),
+        "count": rng.integers(0, 50, n),
+        "small": rng.choice(["a", "b", "c"], n),
+        "wide": rng.choice([f"k{i:02d}" for i in range(15)], n),
+        "flag": rng.choice([True, False], n),
+        # Numeric in the early chunks, text only near the end of the file
+        "late": np.r_[rng.integers(0, 3, n - 20).astype(str), ["x"] * 20],
+        "target": rng.integers(0, 2, n),
+    })
+    df["num"] = df["num"].mask(np.arange(n) % 7 == 0)
+    df["small"] = df["small"].mask(np.arange(n) % 11 == 0)
+    df.to_csv(path, index=False)
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    _write_streaming_csv(csv_path)
+
+    in_memory, y_mem = preprocess_tabular(pd.read_csv(csv_path), target_col="target")
+    # A tiny chunk size forces many chunks, so "late" changes type mid-file
+    streamed, y_stream = preprocess_tabular_streaming(str(csv_path), target_col="target", chunk_size_mb=0.002)
+
+    assert streamed["feature_names"] == in_memory["feature_names"]
+    assert streamed["numeric_cols"] == in_memory["numeric_cols"]
+    np.testing.assert_array_equal(y_stream, y_mem)
+    for key in ("X_train", "X_val", "X_test"):
+        np.testing.assert_allclose(streamed[key], in_memory[key], atol=1e-5)
+    for key in ("y_train", "y_val", "y_test"):
+        np.testing.assert_array_equal(streamed[key], in_memory[key])
+
+    features = pd.read_csv(csv_path).drop(columns=["target"])
+    np.testing.assert_allclose(
+        streamed["column_transformer"].transform(features),
+        in_memory["column_transformer"].transform(features),
+        atol=1e-5,
+    )
+
+
+def test_streaming_removes_memmap_on_error(tmp_path, monkeypatch):
+    csv_path = tmp_path / "data.csv"
+    _write_streaming_csv(csv_path)
+    memmap_dir = tmp_path / "mm"
+    memmap_dir.mkdir()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("encode failed")
+
+    monkeypatch.setattr(tabular_preprocessing, "_encode_chunk", fail)
+    with pytest.raises(RuntimeError):
+        preprocess_tabular_streaming(str(csv_path), target_col="target", memmap_dir=str(memmap_dir))
+    assert list(memmap_dir.iterdir()) == []
+
+
+def test_run_pipeline_streaming_ignores_unknown_params(tmp_path):
+    from automl.pipeline import run_pipeline
+
+    csv_path = tmp_path / "data.csv"
+    _write_streaming_csv(csv_path)
+    results = run_pipeline(
+        str(csv_path),
+        target_column="target",
+        task_type="classification",
+        feature_selection_enabled=False,
+        hyperparameter_tuning_enabled=False,
+        preprocessing_params={"data_type_override": "tabular", "chunk_size_mb": 0.002},
+        artifacts_dir=tmp_path / "artifacts",
+        streaming_threshold_mb=0,
+    )
+    assert results["best_model_name"]